@@ -91,7 +91,10 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_db():
-    """Close database connections on shutdown"""
+    """Close HTTP sessions and database connections on shutdown"""
+    await app.state.agent_kit_client.close()
+    await app.state.allora_client.close()
+    await app.state.agent_manager.close()
     await app.state.db_manager.close()
 # # # Auth dependency - simplified for hackathon
 # # async def get_user_from_token(token: str = Query(...)):
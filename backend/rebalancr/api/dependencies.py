@@ -305,12 +305,13 @@ def initialize_intelligence_services():
     )
     
     # 12. Import rebalancer only after intelligence_engine is fully initialized
-    from ..execution.providers.rebalancer.rebalancer_action_provider import rebalancer_action_provider
+    from ..execution.providers.rebalancer import get_rebalancer_provider
     from ..intelligence.reviewer import TradeReviewer
 
     # First, get or create a trade reviewer if needed
     trade_reviewer = TradeReviewer()
 
+    rebalancer_action_provider = get_rebalancer_provider()
     rebalancer_provider = rebalancer_action_provider(
         wallet_provider=wallet_provider,
         intelligence_engine=intelligence_engine,
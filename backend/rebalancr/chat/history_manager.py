@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime
 import uuid
 
@@ -59,6 +59,30 @@ class ChatHistoryManager:
         # Store in database using add_message
         return await self.add_message(message_data)
         
+    async def store_messages_bulk(self, 
+                            items: Iterable[Tuple[str, str, str, Optional[str], str]]) -> int:
+        """
+        Store several chat messages in one database transaction
+        
+        Args:
+            items: (user_id, message, message_type, conversation_id, timestamp)
+                tuples; a missing conversation_id gets a new one as in store_message
+            
+        Returns:
+            Number of messages stored
+        """
+        messages = [
+            {
+                "conversation_id": conversation_id or str(uuid.uuid4()),
+                "user_id": user_id,
+                "message": message,
+                "message_type": message_type,
+                "timestamp": timestamp
+            }
+            for user_id, message, message_type, conversation_id, timestamp in items
+        ]
+        return await self.db_manager.insert_chat_messages(messages)
+        
     async def get_messages(self, conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Retrieve messages for a specific conversation
@@ -67,6 +67,11 @@ class Settings(BaseSettings):
     
     # Privy Server Wallets
     sqlite_db_path: str = "sqlite:///./data/rebalancr.db"
+    # Opt-in: keep LangGraph checkpoints in the chat history database file
+    # (DatabaseManager's rebalancr.db) instead of sqlite_db_path. Existing
+    # conversation state is not moved; copy the checkpoint tables over
+    # before enabling, or earlier threads start fresh
+    share_checkpoint_db: bool = False
     wallet_data_dir: str = "./data/wallets"
     
     class Config:
@@ -141,7 +146,9 @@ STRATEGY_CONFIG = {
 REVIEWER_CONFIG = {
     "USE_EXTERNAL_AI": os.environ.get("USE_EXTERNAL_AI", "false").lower() == "true",
     "REVIEWER_API_KEY": os.environ.get("REVIEWER_API_KEY", ""),
-    "REVIEWER_API_URL": os.environ.get("REVIEWER_API_URL", "")
+    "REVIEWER_API_URL": os.environ.get("REVIEWER_API_URL", ""),
+    # Ask the provider for a JSON object response (OpenAI-style response_format)
+    "REVIEWER_JSON_MODE": os.environ.get("REVIEWER_JSON_MODE", "true").lower() == "true"
 }
 
 
@@ -8,6 +8,14 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Fixed statements for the auto-rebalance toggles. Keeping the SQL text
+# constant lets sqlite3's per-connection statement cache reuse the prepared
+# statement instead of re-parsing a dynamically built UPDATE each time.
+_AUTO_REBALANCE_ON_SQL = (
+    "UPDATE portfolios SET auto_rebalance = 1, max_slippage = ?, check_interval = ? WHERE id = ?"
+)
+_AUTO_REBALANCE_OFF_SQL = "UPDATE portfolios SET auto_rebalance = 0 WHERE id = ?"
+
 class DatabaseManager:
     def __init__(self, db_path=None):
         # Use the standard path by default
@@ -256,9 +264,47 @@ class DatabaseManager:
             }
         except Exception as e:
             logger.error(f"Error inserting chat message: {str(e)}")
+            await conn.rollback()
             # Standardized error handling - return None on failure
             return None
 
+    async def insert_chat_messages(self, messages):
+        """Insert several chat messages in a single transaction
+        
+        Each message dict needs conversation_id, user_id, message, message_type
+        and timestamp. Returns the number of rows inserted, or 0 on failure.
+        """
+        if not messages:
+            return 0
+        
+        conn = await self._get_connection()
+        try:
+            await conn.executemany(
+                """
+                INSERT INTO chat_history 
+                (conversation_id, user_id, message, message_type, timestamp) 
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        message_data["conversation_id"],
+                        message_data["user_id"],
+                        message_data["message"],
+                        message_data["message_type"],
+                        message_data["timestamp"]
+                    )
+                    for message_data in messages
+                ]
+            )
+            
+            await conn.commit()
+            return len(messages)
+        except Exception as e:
+            logger.error(f"Error inserting chat messages: {str(e)}")
+            # Don't leave the failed batch for the next commit to pick up
+            await conn.rollback()
+            return 0
+
     async def get_chat_messages(self, conversation_id, limit=50):
         """Get messages for a specific conversation"""
         conn = await self._get_connection()
@@ -408,6 +454,29 @@ class DatabaseManager:
             logger.error(f"Error updating portfolio {portfolio_id}: {str(e)}")
             return False
 
+    async def update_portfolio_auto_rebalance_on(self, portfolio_id, max_slippage, check_interval):
+        """Enable auto-rebalance with the given slippage and check interval"""
+        return await self._execute_portfolio_update(
+            _AUTO_REBALANCE_ON_SQL, (max_slippage, check_interval, portfolio_id), portfolio_id
+        )
+
+    async def update_portfolio_auto_rebalance_off(self, portfolio_id):
+        """Disable auto-rebalance for a portfolio"""
+        return await self._execute_portfolio_update(
+            _AUTO_REBALANCE_OFF_SQL, (portfolio_id,), portfolio_id
+        )
+
+    async def _execute_portfolio_update(self, query, params, portfolio_id):
+        """Run a fixed portfolio UPDATE statement and commit"""
+        conn = await self._get_connection()
+        try:
+            await conn.execute(query, params)
+            await conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error updating portfolio {portfolio_id}: {str(e)}")
+            return False
+
     async def log_portfolio_event(self, portfolio_id, event_type, details=None):
         """Log a portfolio event in the database"""
         conn = await self._get_connection()
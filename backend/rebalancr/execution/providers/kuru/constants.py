@@ -3,6 +3,9 @@ import json
 import os
 from pathlib import Path
 import logging
+import sys
+
+from eth_utils import to_checksum_address
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -64,9 +67,19 @@ TOKEN_ADDRESSES = {
     }
 }
 
+def _freeze_addresses(addresses_by_group):
+    """Rewrite nested address maps to interned checksum addresses in place"""
+    for addresses in addresses_by_group.values():
+        for key, address in addresses.items():
+            addresses[key] = sys.intern(to_checksum_address(address))
+    return addresses_by_group
+
 # Native token address (ETH, MON)
 NATIVE_TOKEN_ADDRESS = "0x0000000000000000000000000000000000000000"
 
+# Multicall3, deployed at the same address on Base, Base Sepolia and Monad testnet
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
 # Contract addresses by chain_id
 KURU_CONTRACT_ADDRESSES = {
     10143: {  # Monad testnet
@@ -78,6 +91,19 @@ KURU_CONTRACT_ADDRESSES = {
     }
 }
 
+# Normalize every known address to checksum form once at import time
+_freeze_addresses(TOKEN_ADDRESSES)
+_freeze_addresses(MARKET_ADDRESSES)
+_freeze_addresses(KURU_CONTRACT_ADDRESSES)
+
+# Addresses already in checksum form, so call sites can skip re-hashing them
+CHECKSUM_ADDRESSES = frozenset(
+    address
+    for addresses_by_group in (TOKEN_ADDRESSES, MARKET_ADDRESSES, KURU_CONTRACT_ADDRESSES)
+    for addresses in addresses_by_group.values()
+    for address in addresses.values()
+)
+
 # Default RPC URLs for each chain
 DEFAULT_RPC_URLS = {
     8453: "https://base-mainnet.public.blastapi.io",  # Base Mainnet
@@ -85,6 +111,20 @@ DEFAULT_RPC_URLS = {
     10143: "https://testnet-rpc.monad.xyz",  # Monad Testnet
 }
 
+# Candidate RPC endpoints per chain, ranked by latency at runtime (see rpc_pool.py)
+RPC_ENDPOINTS = {
+    8453: [
+        "https://base-mainnet.public.blastapi.io",
+        "https://mainnet.base.org",
+    ],
+    84532: [
+        "https://sepolia.base.org",
+    ],
+    10143: [
+        "https://testnet-rpc.monad.xyz",
+    ],
+}
+
 # Load ABIs
 MARGIN_ACCOUNT_ABI = load_abi('margin_account.json')
 KURU_MARKET_ABI = load_abi('order_book.json')
@@ -37,11 +37,15 @@ from .constants import (
     KURU_CONTRACT_ADDRESSES,
     DEPOSITABLE_TOKENS,
 )
-from .utils import approve_token, format_amount_from_decimals, format_amount_with_decimals
+from .utils import approve_token, format_amount_from_decimals, format_amount_with_decimals, multicall_read, to_checksum
+from .rpc_pool import create_pooled_provider
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Tokens whose margin account balances are listed in the portfolio summary
+PORTFOLIO_TOKEN_IDS = ("usdc", "usdt", "dak", "chog", "yaki", "native")
+
 class KuruActionProvider(ActionProvider[EvmWalletProvider]):
     """Provides actions for interacting with Kuru DEX through direct contract calls."""
 
@@ -80,8 +84,8 @@ class KuruActionProvider(ActionProvider[EvmWalletProvider]):
             return False
             
         try:
-            # Create Web3 instance
-            self.web3_providers[chain_id] = Web3(Web3.HTTPProvider(rpc_url))
+            # Create Web3 instance; reads go to the fastest endpoint, writes to rpc_url
+            self.web3_providers[chain_id] = Web3(create_pooled_provider(chain_id, primary=rpc_url))
             # Test connection
             if not self.web3_providers[chain_id].is_connected():
                 logger.error(f"Failed to connect to RPC endpoint {rpc_url}")
@@ -112,7 +116,7 @@ class KuruActionProvider(ActionProvider[EvmWalletProvider]):
         web3 = self.web3_providers[chain_id]
         
         # Create and return contract instance
-        return web3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        return web3.eth.contract(address=to_checksum(address), abi=abi)
     
     def _get_token_address(self, network_id: str, token_id: str) -> str:
         """Get token address from token ID"""
@@ -523,10 +527,32 @@ Important notes:
         # Get margin contract
         margin_contract = self._get_contract(chain_id, margin_account, KURU_MARGIN_ABI)
         
-        # Call balanceOf function
-        balance = margin_contract.functions.tokenBalances(token_address).call()
+        # Call getBalance function
+        balance = margin_contract.functions.getBalance(wallet_provider.get_address(), token_address).call()
         
         return balance
+    
+    def _get_margin_balances(self,
+                               wallet_provider: EvmWalletProvider,
+                               chain_id: int,
+                               token_addresses: List[str]) -> List[Optional[int]]:
+        """Get margin account balances for several tokens in one Multicall3 eth_call
+        
+        Returns:
+            Balances in the same order as token_addresses; None where the read reverted
+        """
+        margin_account = self._get_margin_account(chain_id)
+        margin_contract = self._get_contract(chain_id, margin_account, KURU_MARGIN_ABI)
+        user_address = wallet_provider.get_address()
+        
+        calls = [
+            (margin_account, margin_contract.encode_abi("getBalance", args=[user_address, token_address]))
+            for token_address in token_addresses
+        ]
+        return [
+            int.from_bytes(return_data, "big") if return_data is not None and len(return_data) == 32 else None
+            for return_data in multicall_read(self.web3_providers[chain_id], calls)
+        ]
 
     def _get_orderbook(self,
                           wallet_provider: EvmWalletProvider,
@@ -1012,28 +1038,33 @@ Important notes:
             # Add margin account balances section
             portfolio_md += "## Margin Account Balances\n\n"
             
-            # Get margin account
-            margin_account = self._get_margin_account(chain_id)
-            
-            # Check balances for each supported token
-            tokens_checked = 0
-            for token_id in ["usdc", "usdt", "dak", "chog", "yaki", "native"]:
+            # Resolve each supported token on this network
+            token_ids = []
+            token_addresses = []
+            for token_id in PORTFOLIO_TOKEN_IDS:
                 try:
-                    token_address = self._get_token_address(network_id, token_id)
-                    balance = self._get_margin_balance(
-                        wallet_provider=wallet_provider,
-                        chain_id=chain_id,
-                        token_address=token_address
-                    )
-                    
-                    if balance > 0:
-                        # Format balance for display
-                        balance_decimal = Web3.from_wei(balance, 'ether')
-                        portfolio_md += f"- **{token_id.upper()}**: {balance_decimal}\n"
-                        tokens_checked += 1
+                    token_addresses.append(self._get_token_address(network_id, token_id))
+                    token_ids.append(token_id)
                 except Exception as e:
                     logger.warning(f"Error checking balance for {token_id}: {str(e)}")
             
+            # Read every balance in a single round-trip
+            balances = self._get_margin_balances(
+                wallet_provider=wallet_provider,
+                chain_id=chain_id,
+                token_addresses=token_addresses
+            )
+            
+            tokens_checked = 0
+            for token_id, balance in zip(token_ids, balances):
+                if balance is None:
+                    logger.warning(f"Error checking balance for {token_id}: margin account read reverted")
+                elif balance > 0:
+                    # Format balance for display
+                    balance_decimal = Web3.from_wei(balance, 'ether')
+                    portfolio_md += f"- **{token_id.upper()}**: {balance_decimal}\n"
+                    tokens_checked += 1
+            
             if tokens_checked == 0:
                 portfolio_md += "No tokens found in your margin account.\n\n"
             else:
@@ -0,0 +1,175 @@
+"""Latency-ranked RPC endpoint pool for Kuru action provider."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from web3 import Web3
+
+from rebalancr.utils.http import get_pooled_session
+from .constants import RPC_ENDPOINTS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Methods that must go to the configured primary endpoint
+WRITE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+# Reads that depend on recent writes (nonces, allowances, receipts); they go
+# to the primary first for READ_AFTER_WRITE_WINDOW seconds after a write, so
+# a lagging public node can't serve stale state
+STATE_READ_METHODS = frozenset({
+    "eth_call",
+    "eth_estimateGas",
+    "eth_getBalance",
+    "eth_getTransactionCount",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+})
+READ_AFTER_WRITE_WINDOW = 15.0
+
+# Number of fastest endpoints kept in the active pool
+ACTIVE_POOL_SIZE = 3
+
+# Seconds an endpoint stays out of rotation after a failure
+EJECT_COOLDOWN = 30.0
+
+class RpcEndpointPool:
+    """Ranks RPC endpoints by measured latency and tracks unhealthy ones
+
+    Endpoints are probed on a background thread, so construction doesn't
+    block; until the probes land, unmeasured endpoints rank in configured
+    order with the primary first.
+    """
+
+    def __init__(self, endpoints: List[str], primary: Optional[str] = None, timeout: float = 5.0):
+        if not endpoints and not primary:
+            raise ValueError("At least one RPC endpoint is required")
+
+        self.primary = primary or endpoints[0]
+        self.endpoints = list(dict.fromkeys([self.primary, *endpoints]))
+        self.timeout = timeout
+
+        self._latencies: Dict[str, float] = {}
+        self._ejected_until: Dict[str, float] = {}
+        self._primary_reads_until = 0.0
+        self._lock = threading.Lock()
+
+        self._probe_thread = threading.Thread(target=self.probe, name="rpc-endpoint-probe", daemon=True)
+        self._probe_thread.start()
+
+    def probe(self) -> None:
+        """Measure eth_blockNumber round-trip time for every endpoint"""
+        session = get_pooled_session()
+        for endpoint in self.endpoints:
+            payload = {"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}
+            start = time.monotonic()
+            try:
+                response = session.post(endpoint, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                latency = time.monotonic() - start
+            except requests.RequestException as e:
+                logger.warning(f"RPC endpoint {endpoint} failed probe: {str(e)}")
+                latency = float("inf")
+            with self._lock:
+                self._latencies[endpoint] = latency
+
+    def active(self) -> List[str]:
+        """Get the fastest healthy endpoints, best first"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                endpoint for endpoint in self.endpoints
+                if self._ejected_until.get(endpoint, 0.0) <= now
+            ]
+            healthy.sort(key=lambda endpoint: self._latencies.get(endpoint, float("inf")))
+        return healthy[:ACTIVE_POOL_SIZE] or [self.primary]
+
+    def candidates(self, method: str) -> List[str]:
+        """Get the endpoints to try for a method, in order
+
+        Writes only go to the primary. State-sensitive reads shortly after a
+        write try the primary first and fail over to the active pool.
+        """
+        if method in WRITE_METHODS:
+            return [self.primary]
+        active = self.active()
+        if method in STATE_READ_METHODS and time.monotonic() < self._primary_reads_until:
+            return [self.primary, *(endpoint for endpoint in active if endpoint != self.primary)]
+        return active
+
+    def note_write(self) -> None:
+        """Pin state-sensitive reads to the primary for READ_AFTER_WRITE_WINDOW seconds"""
+        with self._lock:
+            self._primary_reads_until = time.monotonic() + READ_AFTER_WRITE_WINDOW
+
+    def eject(self, endpoint: str) -> None:
+        """Take an endpoint out of rotation for EJECT_COOLDOWN seconds"""
+        with self._lock:
+            self._ejected_until[endpoint] = time.monotonic() + EJECT_COOLDOWN
+        logger.warning(f"Ejected RPC endpoint {endpoint} for {EJECT_COOLDOWN}s")
+
+    def record(self, endpoint: str, latency: float) -> None:
+        """Fold a measured latency into the endpoint's running estimate"""
+        with self._lock:
+            previous = self._latencies.get(endpoint, float("inf"))
+            if previous == float("inf"):
+                self._latencies[endpoint] = latency
+            else:
+                self._latencies[endpoint] = 0.8 * previous + 0.2 * latency
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """HTTP provider that routes reads to the fastest endpoint in an RpcEndpointPool
+
+    Writes are pinned to the pool's primary endpoint so nonces and
+    transaction propagation stay consistent, and reads of state they change
+    follow them there for a short window.
+    """
+
+    def __init__(self, pool: RpcEndpointPool, **kwargs: Any):
+        super().__init__(pool.primary, session=get_pooled_session(), **kwargs)
+        self.pool = pool
+
+    def make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        """Dispatch a JSON-RPC request, retrying the next endpoint on failure"""
+        candidates = self.pool.candidates(method)
+
+        request_data = self.encode_rpc_request(method, params)
+        session = get_pooled_session()
+        last_error: Optional[Exception] = None
+
+        for endpoint in candidates:
+            start = time.monotonic()
+            try:
+                response = session.post(
+                    endpoint,
+                    data=request_data,
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.pool.timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as e:
+                last_error = e
+                self.pool.eject(endpoint)
+                continue
+            self.pool.record(endpoint, time.monotonic() - start)
+            if method in WRITE_METHODS:
+                self.pool.note_write()
+            return self.decode_rpc_response(response.content)
+
+        raise ConnectionError(f"All RPC endpoints failed for {method}: {str(last_error)}")
+
+def create_pooled_provider(chain_id: int, primary: Optional[str] = None) -> PooledHTTPProvider:
+    """Create a pooled provider for a chain
+
+    Args:
+        chain_id: Chain ID
+        primary: Endpoint used for writes; defaults to the first known endpoint
+
+    Returns:
+        Provider routing reads across RPC_ENDPOINTS[chain_id]
+    """
+    pool = RpcEndpointPool(RPC_ENDPOINTS.get(chain_id, []), primary=primary)
+    return PooledHTTPProvider(pool)
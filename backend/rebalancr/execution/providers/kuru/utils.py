@@ -1,18 +1,198 @@
 """Utility functions for Kuru action provider."""
 
-from typing import Any, Dict, Optional, Union, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union, List, Tuple
 from decimal import Decimal
 
 import logging
-from web3 import Web3
-from web3.types import Wei
+import re
+import time
+import requests
 
-from coinbase_agentkit.wallet_providers import EvmWalletProvider
-from .constants import ERC20_ABI, TOKEN_ADDRESSES, MARKET_ADDRESSES, NETWORK_ID_TO_CHAIN_ID
+# web3 and coinbase_agentkit are imported inside the functions that need them,
+# so amount/address helpers can be used without loading them
+if TYPE_CHECKING:
+    from web3 import Web3
+    from coinbase_agentkit.wallet_providers import EvmWalletProvider
+from rebalancr.utils.http import get_pooled_session
+from .constants import IERC20_ABI, TOKEN_ADDRESSES, MARKET_ADDRESSES, NETWORK_ID_TO_CHAIN_ID, CHECKSUM_ADDRESSES, MULTICALL3_ADDRESS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Minimal ERC20 ABI covering only the calls made from this module, so
+# contract construction does not parse the full token interface
+ERC20_ABI_MIN = [
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "spender", "type": "address"},
+            {"internalType": "uint256", "name": "amount", "type": "uint256"}
+        ],
+        "name": "approve",
+        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "owner", "type": "address"},
+            {"internalType": "address", "name": "spender", "type": "address"}
+        ],
+        "name": "allowance",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+def _contract_read_errors() -> Tuple[type, ...]:
+    """Errors raised by a failed or reverted contract read"""
+    from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+    return (BadFunctionCallOutput, ContractLogicError, ValueError, requests.RequestException)
+
+# Zero address, standing in for the native token; compare lowercased inputs
+ZERO_ADDR = "0x" + "00" * 20
+
+# Powers of ten for every decimals value a uint256 amount can carry
+_POW10 = [10**i for i in range(78)]
+
+# Plain decimal strings such as "1000" or "-1.5" (no exponent or whitespace)
+_PLAIN_DECIMAL_RE = re.compile(r"-?\d+(\.\d+)?")
+
+# Maximum ERC20 allowance, approved once per (owner, token, spender)
+MAX_UINT256 = 2**256 - 1
+
+# (owner, token, spender) triples that already hold a max allowance
+_APPROVED: Dict[Tuple[str, str, str], bool] = {}
+
+def to_checksum(address: str) -> str:
+    """Checksum an address, skipping the keccak for known constant addresses"""
+    if address in CHECKSUM_ADDRESSES:
+        return address
+    from web3 import Web3
+    return Web3.to_checksum_address(address)
+
+# Sent approval transactions awaiting a receipt, tx hash -> approval key
+_PENDING_APPROVALS: Dict[str, Tuple[str, str, str]] = {}
+
+# ERC20 contract objects keyed by (web3 instance id, checksum address)
+_ERC20_CONTRACTS: Dict[Tuple[int, str], Any] = {}
+
+def _get_erc20_contract(wallet_provider: "EvmWalletProvider", token_address: str):
+    """Get a cached ERC20 contract bound to the wallet provider's Web3 instance
+    
+    Args:
+        wallet_provider: Wallet provider
+        token_address: Token address
+        
+    Returns:
+        ERC20 contract instance
+    """
+    web3 = wallet_provider._web3
+    key = (id(web3), token_address)
+    contract = _ERC20_CONTRACTS.get(key)
+    if contract is None:
+        contract = web3.eth.contract(
+            address=to_checksum(token_address),
+            abi=ERC20_ABI_MIN
+        )
+        _ERC20_CONTRACTS[key] = contract
+    return contract
+
+def _rpc_batch(web3: "Web3", calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+    """Send several JSON-RPC calls to the node in a single HTTP request
+    
+    Args:
+        web3: Web3 instance backed by an HTTP provider
+        calls: List of (method, params) tuples
+        
+    Returns:
+        Results in the same order as calls
+        
+    Raises:
+        ValueError: If the endpoint does not support batches, or any call in
+            the batch returns an error
+    """
+    endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+    if not endpoint_uri:
+        # Not an HTTP provider, fall back to one request per call
+        return [web3.provider.make_request(method, params)["result"] for method, params in calls]
+    
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = get_pooled_session().post(endpoint_uri, json=payload, timeout=30)
+    response.raise_for_status()
+    
+    body = response.json()
+    if not isinstance(body, list):
+        # Endpoints without batch support answer with a single error object
+        error = body.get("error", body) if isinstance(body, dict) else body
+        raise ValueError(f"RPC batch request rejected: {error}")
+    
+    results: List[Any] = [None] * len(calls)
+    for item in body:
+        if "error" in item:
+            raise ValueError(f"RPC error in {calls[item['id']][0]}: {item['error']}")
+        results[item["id"]] = item["result"]
+    return results
+
+def _prefetch_tx_params(wallet_provider: "EvmWalletProvider", tx_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill nonce, gas and EIP-1559 fees with one batched RPC round-trip
+    
+    The wallet provider otherwise fetches these sequentially inside
+    send_transaction. Gas limit and fees come from the provider's own
+    gas_limit_for/fees_for_base_fee, so both paths price transactions the
+    same way; providers without them are left to fill the fields themselves.
+    
+    Args:
+        wallet_provider: Wallet provider
+        tx_params: Transaction parameters with at least "to" and "data"
+        
+    Returns:
+        Transaction parameters with nonce, gas and fee fields set
+    """
+    gas_limit_for = getattr(wallet_provider, "gas_limit_for", None)
+    fees_for_base_fee = getattr(wallet_provider, "fees_for_base_fee", None)
+    if gas_limit_for is None or fees_for_base_fee is None:
+        return tx_params
+    
+    address = wallet_provider.get_address()
+    estimate_params = {
+        "from": address,
+        "to": to_checksum(tx_params["to"]),
+        "data": tx_params.get("data", "0x"),
+        "value": hex(tx_params.get("value", 0)),
+    }
+    nonce_hex, gas_hex, latest_block = _rpc_batch(wallet_provider._web3, [
+        ("eth_getTransactionCount", [address, "pending"]),
+        ("eth_estimateGas", [estimate_params]),
+        ("eth_getBlockByNumber", ["latest", False]),
+    ])
+    max_priority_fee_per_gas, max_fee_per_gas = fees_for_base_fee(int(latest_block["baseFeePerGas"], 16))
+    
+    prepared = dict(tx_params)
+    prepared["nonce"] = int(nonce_hex, 16)
+    prepared["gas"] = gas_limit_for(int(gas_hex, 16))
+    prepared["maxPriorityFeePerGas"] = max_priority_fee_per_gas
+    prepared["maxFeePerGas"] = max_fee_per_gas
+    prepared["type"] = 2
+    return prepared
+
 def get_token_address(network_id: str, token_id: str) -> str:
     """Get token address from token ID for a specific network
     
@@ -28,7 +208,7 @@ def get_token_address(network_id: str, token_id: str) -> str:
     """
     # Native token has a special address
     if token_id.lower() == "native":
-        return "0x0000000000000000000000000000000000000000"
+        return ZERO_ADDR
     
     try:
         return TOKEN_ADDRESSES[network_id][token_id.lower()]
@@ -53,6 +233,39 @@ def get_market_address(network_id: str, market_id: str) -> str:
     except KeyError:
         raise ValueError(f"Unknown market: {market_id} for network {network_id}")
 
+def _make_amount_formatter(decimals: int):
+    """Build a human-readable -> wei converter with decimals baked in
+    
+    Args:
+        decimals: Token decimals
+        
+    Returns:
+        Function converting an amount to wei
+    """
+    scale = _POW10[decimals]
+    padding = "0" * decimals
+    match_plain = _PLAIN_DECIMAL_RE.fullmatch
+    
+    def format_amount(amount: Union[str, int, float, Decimal]) -> int:
+        # Integral amounts never need Decimal
+        if isinstance(amount, int):
+            return amount * scale
+        
+        # Plain decimal strings are shifted as digits, truncating extra precision
+        # the same way int(Decimal(...)) truncates toward zero
+        if isinstance(amount, str) and match_plain(amount):
+            whole, _, fraction = amount.partition(".")
+            return int(whole + (fraction + padding)[:decimals])
+        
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        return int(amount * scale)
+    
+    return format_amount
+
+# Converters for the decimals used by common tokens (USDC/USDT, WBTC, native)
+_AMOUNT_FORMATTERS = {decimals: _make_amount_formatter(decimals) for decimals in (6, 8, 18)}
+
 def format_amount_with_decimals(amount: Union[str, int, float, Decimal], decimals: int = 18) -> int:
     """Format human-readable amount to wei
     
@@ -63,14 +276,10 @@ def format_amount_with_decimals(amount: Union[str, int, float, Decimal], decimal
     Returns:
         Amount in wei
     """
-    if isinstance(amount, str):
-        amount = Decimal(amount)
-    
-    if isinstance(amount, (int, float)):
-        amount = Decimal(str(amount))
-    
-    # Convert to wei
-    return int(amount * Decimal(10) ** Decimal(decimals))
+    formatter = _AMOUNT_FORMATTERS.get(decimals)
+    if formatter is None:
+        formatter = _make_amount_formatter(decimals)
+    return formatter(amount)
 
 def format_amount_from_decimals(amount: int, decimals: int = 18) -> str:
     """Format wei amount to human-readable format
@@ -83,9 +292,9 @@ def format_amount_from_decimals(amount: int, decimals: int = 18) -> str:
         Human-readable amount
     """
     # Convert from wei
-    return str(Decimal(amount) / Decimal(10) ** Decimal(decimals))
+    return str(Decimal(amount) / _POW10[decimals])
 
-def get_token_symbol(wallet_provider: EvmWalletProvider, token_address: str) -> str:
+def get_token_symbol(wallet_provider: "EvmWalletProvider", token_address: str) -> str:
     """Get token symbol
     
     Args:
@@ -96,7 +305,7 @@ def get_token_symbol(wallet_provider: EvmWalletProvider, token_address: str) ->
         Token symbol
     """
     # Native token
-    if token_address == "0x0000000000000000000000000000000000000000":
+    if token_address.lower() == ZERO_ADDR:
         network = wallet_provider.get_network()
         # Return appropriate symbol based on network
         if network.network_id.startswith("monad"):
@@ -106,8 +315,8 @@ def get_token_symbol(wallet_provider: EvmWalletProvider, token_address: str) ->
     try:
         # Create contract instance
         contract = wallet_provider._web3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
+            address=to_checksum(token_address),
+            abi=IERC20_ABI
         )
         
         # Call symbol function
@@ -116,7 +325,7 @@ def get_token_symbol(wallet_provider: EvmWalletProvider, token_address: str) ->
         logger.warning(f"Error getting token symbol: {str(e)}")
         return "UNKNOWN"
 
-def get_portfolio_summary(wallet_provider: EvmWalletProvider, market_address: str) -> str:
+def get_portfolio_summary(wallet_provider: "EvmWalletProvider", market_address: str) -> str:
     """Get portfolio summary in markdown format
     
     Args:
@@ -148,103 +357,315 @@ def get_portfolio_summary(wallet_provider: EvmWalletProvider, market_address: st
 
 """
 
-def get_token_decimals(wallet_provider: EvmWalletProvider, token_address: str) -> int:
-    """Get token decimals"""
+def get_token_decimals(wallet_provider: "EvmWalletProvider", token_address: str) -> Optional[int]:
+    """Get token decimals, or None if the contract read fails"""
     # ETH has 18 decimals
-    if token_address == "0x0000000000000000000000000000000000000000":
+    if token_address.lower() == ZERO_ADDR:
         return 18
     
     # For ERC20 tokens, get decimals from contract
     try:
-        # Create contract instance
-        contract = wallet_provider._web3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
-        )
+        contract = _get_erc20_contract(wallet_provider, token_address)
         
         # Call decimals function
         return contract.functions.decimals().call()
-    except Exception as e:
-        # Default to 18 decimals if something goes wrong
-        return 18
+    except _contract_read_errors() as e:
+        logger.warning(f"Error getting token decimals for {token_address}: {str(e)}")
+        return None
 
-def get_token_balance(wallet_provider: EvmWalletProvider, token_address: str) -> int:
-    """Get token balance for address"""
+def get_token_balance(wallet_provider: "EvmWalletProvider", token_address: str) -> Optional[int]:
+    """Get token balance for address, or None if the contract read fails"""
     address = wallet_provider.get_address()
     
     # For ETH, get balance from web3
-    if token_address == "0x0000000000000000000000000000000000000000":
+    if token_address.lower() == ZERO_ADDR:
         #wallet_provider.get_balance(address)
         return wallet_provider._web3.eth.get_balance(address)
     
     # For ERC20 tokens, call balanceOf
     try:
-        # Create contract instance
-        contract = wallet_provider._web3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
-        )
+        contract = _get_erc20_contract(wallet_provider, token_address)
         
         # Call balanceOf function
         return contract.functions.balanceOf(address).call()
-    except Exception as e:
-        return 0
+    except _contract_read_errors() as e:
+        logger.warning(f"Error getting token balance for {token_address}: {str(e)}")
+        return None
 
-def approve_token(wallet_provider: EvmWalletProvider, token_address: str, spender_address: str, amount: int) -> Dict[str, Any]:
-    """Approve a spender to use tokens
+def send_approval(
+    wallet_provider: "EvmWalletProvider",
+    token_address: str,
+    spender_address: str,
+    amount: int,
+    min_nonce: Optional[int] = None
+) -> Optional[Tuple[str, int]]:
+    """Send a MAX_UINT256 approval without waiting for it to be mined
     
     Args:
         wallet_provider: The wallet provider
         token_address: The address of the token to approve
         spender_address: The address of the spender to approve
-        amount: The amount to approve in wei
+        amount: The amount needed in wei
+        min_nonce: Lowest nonce to use, for sending several approvals back-to-back
         
     Returns:
-        Transaction receipt
-        
-    Raises:
-        Exception: If the approval transaction fails
+        (transaction hash, nonce), or None if no approval is needed
     """
     # Native ETH doesn't need approval
-    if token_address == "0x0000000000000000000000000000000000000000":
+    if token_address.lower() == ZERO_ADDR:
         return None
-        
+    
+    owner = wallet_provider.get_address()
+    approval_key = (owner.lower(), token_address.lower(), spender_address.lower())
+    if approval_key in _APPROVED:
+        return None
+    
+    # Token contract bound to the wallet's connected Web3 instance
+    contract = _get_erc20_contract(wallet_provider, token_address)
+    
+    # Skip the transaction if the current allowance is already sufficient
+    allowance = contract.functions.allowance(
+        owner, to_checksum(spender_address)
+    ).call()
+    if allowance >= amount:
+        if allowance == MAX_UINT256:
+            _APPROVED[approval_key] = True
+        return None
+    
+    # Encode the approve function call
+    encoded_data = contract.encode_abi(
+        "approve",
+        args=[to_checksum(spender_address), MAX_UINT256]
+    )
+    
+    # Prepare transaction, fetching nonce/gas/fees in a single round-trip
+    tx_params = {
+        "to": token_address,
+        "data": encoded_data,
+    }
     try:
-        # Create token contract
-        contract = Web3().eth.contract(address=token_address, abi=ERC20_ABI)
-        
-        # Encode the approve function call
-        encoded_data = contract.encodeABI(
-            fn_name="approve",
-            args=[spender_address, amount]
+        tx_params = _prefetch_tx_params(wallet_provider, tx_params)
+    except Exception as e:
+        # Let the wallet provider fill them in sequentially
+        logger.warning(f"Batched pre-flight failed, falling back: {str(e)}")
+    if min_nonce is not None:
+        tx_params["nonce"] = max(
+            min_nonce,
+            tx_params["nonce"] if "nonce" in tx_params
+            else wallet_provider._web3.eth.get_transaction_count(owner, "pending")
         )
+    
+    tx_hash = wallet_provider.send_transaction(tx_params)
+    _PENDING_APPROVALS[tx_hash] = approval_key
+    return tx_hash, tx_params.get("nonce", -1)
+
+def wait_for_receipts_batch(
+    web3: "Web3",
+    tx_hashes: List[str],
+    timeout: float = 120,
+    poll_latency: float = 0.5
+) -> Dict[str, Dict[str, Any]]:
+    """Wait for several transactions with one batched receipt poll per block
+    
+    Each mined transaction's receipt is then read with
+    web3.eth.get_transaction_receipt, so it is formatted as a TxReceipt. If
+    the endpoint rejects batches, the rest are waited for one at a time with
+    web3.eth.wait_for_transaction_receipt.
+    
+    Args:
+        web3: Web3 instance
+        tx_hashes: Transaction hashes to wait for
+        timeout: Seconds to wait before giving up
+        poll_latency: Seconds between block number checks
         
-        # Prepare transaction
-        tx_params = {
-            "to": token_address,
-            "data": encoded_data,
-        }
+    Returns:
+        Receipts keyed by transaction hash, formatted as TxReceipts the way
+        web3's wait_for_transaction_receipt returns them
         
-        # Send transaction
-        tx_hash = wallet_provider.send_transaction(tx_params)
+    Raises:
+        TimeoutError: If any transaction is not mined within timeout
+    """
+    from web3.exceptions import TimeExhausted
+    
+    outstanding = list(dict.fromkeys(tx_hashes))
+    receipts: Dict[str, Dict[str, Any]] = {}
+    deadline = time.monotonic() + timeout
+    last_block = None
+    
+    while outstanding:
+        block_number = web3.eth.block_number
+        if block_number != last_block:
+            last_block = block_number
+            try:
+                results = _rpc_batch(
+                    web3,
+                    [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in outstanding]
+                )
+            except ValueError as e:
+                logger.warning(f"Batched receipt poll failed, waiting one at a time: {str(e)}")
+                for tx_hash in outstanding:
+                    try:
+                        receipts[tx_hash] = web3.eth.wait_for_transaction_receipt(
+                            tx_hash,
+                            timeout=max(deadline - time.monotonic(), 0),
+                            poll_latency=poll_latency
+                        )
+                    except TimeExhausted:
+                        raise TimeoutError(f"Transaction {tx_hash} not mined after {timeout}s")
+                break
+            for tx_hash, receipt in zip(list(outstanding), results):
+                if receipt is None:
+                    continue
+                receipts[tx_hash] = web3.eth.get_transaction_receipt(tx_hash)
+                outstanding.remove(tx_hash)
         
-        # Wait for receipt and return it
-        receipt = wallet_provider.wait_for_transaction_receipt(tx_hash)
+        if not outstanding:
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Transactions not mined after {timeout}s: {outstanding}")
+        time.sleep(poll_latency)
+    
+    return receipts
+
+def approve_tokens(
+    wallet_provider: "EvmWalletProvider",
+    approvals: List[Tuple[str, str, int]]
+) -> Dict[str, Dict[str, Any]]:
+    """Send several approvals, then wait for all of their receipts together
+    
+    Args:
+        wallet_provider: The wallet provider
+        approvals: List of (token_address, spender_address, amount) tuples
         
-        if receipt["status"] != 1:
-            raise Exception(f"Approval transaction failed with hash: {tx_hash}")
-            
-        return receipt
+    Returns:
+        Receipts keyed by transaction hash; approvals that were not needed are omitted
+        
+    Raises:
+        Exception: If any approval transaction fails
+    """
+    tx_hashes = []
+    try:
+        next_nonce = None
+        for token_address, spender_address, amount in approvals:
+            sent = send_approval(
+                wallet_provider, token_address, spender_address, amount, min_nonce=next_nonce
+            )
+            if sent is None:
+                continue
+            tx_hash, nonce = sent
+            tx_hashes.append(tx_hash)
+            if nonce >= 0:
+                next_nonce = nonce + 1
+        
+        if not tx_hashes:
+            return {}
+        
+        receipts = wait_for_receipts_batch(wallet_provider._web3, tx_hashes)
+        for tx_hash, receipt in receipts.items():
+            if receipt["status"] != 1:
+                raise Exception(f"Approval transaction failed with hash: {tx_hash}")
+            approval_key = _PENDING_APPROVALS.get(tx_hash)
+            if approval_key is not None:
+                _APPROVED[approval_key] = True
+        return receipts
     except Exception as e:
         raise Exception(f"Error approving token: {str(e)}")
+    finally:
+        # Sent approvals stop being pending whether they succeeded, failed or timed out
+        for tx_hash in tx_hashes:
+            _PENDING_APPROVALS.pop(tx_hash, None)
+
+# Function selectors for Multicall3.aggregate3 and ERC20.balanceOf
+_AGGREGATE3_SELECTOR = "82ad56cb"
+_BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+def get_all_balances(wallet_provider: "EvmWalletProvider", token_addresses: List[str]) -> Dict[str, Optional[int]]:
+    """Get native and ERC20 balances in a single RPC round-trip
+    
+    Sends one JSON-RPC batch holding eth_getBalance and a Multicall3
+    aggregate3 eth_call of balanceOf for every token.
+    
+    Args:
+        wallet_provider: Wallet provider
+        token_addresses: ERC20 token addresses
+        
+    Returns:
+        Balances in wei keyed by token address, with the native balance under
+        ZERO_ADDR; None for tokens whose balanceOf call failed
+    """
+    from eth_abi import decode, encode
+    
+    owner = wallet_provider.get_address()
+    tokens = [address for address in token_addresses if address.lower() != ZERO_ADDR]
+    
+    balance_of_data = _BALANCE_OF_SELECTOR + encode(["address"], [owner])
+    calls = [(to_checksum(address), True, balance_of_data) for address in tokens]
+    aggregate_data = "0x" + _AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [calls]).hex()
+    
+    batch = [("eth_getBalance", [owner, "latest"])]
+    if tokens:
+        batch.append(("eth_call", [{"to": MULTICALL3_ADDRESS, "data": aggregate_data}, "latest"]))
+    results = _rpc_batch(wallet_provider._web3, batch)
+    
+    balances: Dict[str, Optional[int]] = {ZERO_ADDR: int(results[0], 16)}
+    if tokens:
+        (call_results,) = decode(["(bool,bytes)[]"], bytes.fromhex(results[1][2:]))
+        for address, (success, return_data) in zip(tokens, call_results):
+            balances[address] = int.from_bytes(return_data, "big") if success and len(return_data) == 32 else None
+    return balances
+
+def multicall_read(web3: "Web3", calls: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+    """Run several view calls in one eth_call through Multicall3.aggregate3
+    
+    Args:
+        web3: Web3 instance for the chain
+        calls: List of (target address, hex calldata) tuples
+        
+    Returns:
+        Raw return data in the same order as calls; None for calls that reverted
+    """
+    from eth_abi import decode, encode
+    
+    if not calls:
+        return []
+    
+    encoded_calls = [(to_checksum(target), True, bytes.fromhex(data.removeprefix("0x"))) for target, data in calls]
+    aggregate_data = "0x" + _AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [encoded_calls]).hex()
+    result = web3.eth.call({"to": MULTICALL3_ADDRESS, "data": aggregate_data})
+    
+    (call_results,) = decode(["(bool,bytes)[]"], bytes(result))
+    return [return_data if success else None for success, return_data in call_results]
+
+def approve_token(wallet_provider: "EvmWalletProvider", token_address: str, spender_address: str, amount: int) -> Dict[str, Any]:
+    """Approve a spender to use tokens
+    
+    Approves MAX_UINT256 so later trades for the same pair skip the approval
+    transaction entirely. Nothing is sent if the existing allowance already
+    covers amount. Use approve_tokens to approve several pairs at once.
+    
+    Args:
+        wallet_provider: The wallet provider
+        token_address: The address of the token to approve
+        spender_address: The address of the spender to approve
+        amount: The amount needed in wei
+        
+    Returns:
+        Transaction receipt, or None if no approval was needed
+        
+    Raises:
+        Exception: If the approval transaction fails
+    """
+    receipts = approve_tokens(wallet_provider, [(token_address, spender_address, amount)])
+    return next(iter(receipts.values()), None)
 
 def estimate_gas_with_buffer(
+    wallet_provider: "EvmWalletProvider",
     tx_params: Dict[str, Any],
     buffer_percentage: float = 20.0
 ) -> int:
-    """Estimate gas with buffer"""
+    """Estimate gas with buffer using the wallet provider's connected node"""
     try:
-        gas_estimate = Web3().eth.estimate_gas(tx_params)
+        gas_estimate = wallet_provider._web3.eth.estimate_gas(tx_params)
         # Add buffer for safety
         return int(gas_estimate * (1 + buffer_percentage / 100))
     except Exception as e:
@@ -287,7 +708,7 @@ def get_market_tokens(network_id: str, market_id: str) -> Tuple[str, str]:
         base_token = parts[0]
         return (base_token, quote_token)
 
-def get_token_name(wallet_provider: EvmWalletProvider, token_address: str) -> str:
+def get_token_name(wallet_provider: "EvmWalletProvider", token_address: str) -> str:
     """Get token name
     
     Args:
@@ -298,7 +719,7 @@ def get_token_name(wallet_provider: EvmWalletProvider, token_address: str) -> st
         Token name
     """
     # Native token
-    if token_address == "0x0000000000000000000000000000000000000000":
+    if token_address.lower() == ZERO_ADDR:
         network = wallet_provider.get_network()
         # Return appropriate name based on network
         if network.network_id.startswith("monad"):
@@ -308,8 +729,8 @@ def get_token_name(wallet_provider: EvmWalletProvider, token_address: str) -> st
     try:
         # Create contract instance
         contract = wallet_provider._web3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
+            address=to_checksum(token_address),
+            abi=IERC20_ABI
         )
         
         # Call name function
@@ -317,72 +738,3 @@ def get_token_name(wallet_provider: EvmWalletProvider, token_address: str) -> st
     except Exception as e:
         logger.warning(f"Error getting token name: {str(e)}")
         return "Unknown Token"
-
-# from typing import Optional, Dict, Any
-# from decimal import Decimal
-# import asyncio
-# from web3 import Web3
-
-# from .constants import TOKEN_ADDRESSES
-
-# def get_token_address(chain_id: int, symbol: str) -> Optional[str]:
-#     """Get the token address for a given symbol and chain ID"""
-#     chain_tokens = TOKEN_ADDRESSES.get(chain_id, {})
-#     return chain_tokens.get(symbol.upper())
-
-# def format_token_amount(amount: Decimal, decimals: int = 18) -> str:
-#     """Format a token amount with the correct number of decimals"""
-#     return str(int(amount * Decimal(10) ** decimals))
-
-# async def approve_token(client, wallet_provider, token_address: str, spender_address: str, amount: float) -> str:
-#     """Approve spender to use tokens
-    
-#     Args:
-#         client: KuruClient instance
-#         wallet_provider: Wallet provider
-#         token_address: Address of token to approve
-#         spender_address: Address of spender to approve
-#         amount: Amount to approve (in decimal units)
-    
-#     Returns:
-#         Transaction hash of the approval transaction
-#     """
-#     # Convert amount to appropriate units
-#     token_info = await client.get_token_info(token_address)
-#     decimals = token_info.get('decimals', 18)
-#     amount_wei = Web3.to_wei(amount, 'ether' if decimals == 18 else 'mwei' if decimals == 6 else 'ether')
-    
-#     # Prepare the approval transaction
-#     approval_data = client.token_contract.encodeABI(
-#         fn_name='approve',
-#         args=[spender_address, amount_wei]
-#     )
-    
-#     params = {
-#         'to': token_address,
-#         'data': approval_data
-#     }
-    
-#     # Send the transaction
-#     tx_hash = wallet_provider.send_transaction(params)
-    
-#     # Wait for the transaction to be mined
-#     await client.wait_for_transaction(tx_hash)
-    
-#     return tx_hash
-
-# async def verify_transaction_success(client, tx_hash: str, max_attempts: int = 5) -> bool:
-#     """Verify that a transaction was successful"""
-#     for i in range(max_attempts):
-#         try:
-#             receipt = await client.wait_for_transaction(tx_hash)
-#             if receipt and receipt.get('status') == 1:
-#                 return True
-#             elif receipt:
-#                 return False
-#         except Exception:
-#             if i == max_attempts - 1:
-#                 return False
-#             # Wait longer between attempts
-#             await asyncio.sleep(2 ** i)  # Exponential backoff
-#     return False
\ No newline at end of file
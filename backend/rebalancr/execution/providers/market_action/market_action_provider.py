@@ -5,7 +5,8 @@ Provides actions for market analysis and predictions, implementing the AgentKit
 """
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Type, Union
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Type, Union
 from pydantic import BaseModel, Field, validator
 from decimal import Decimal
 
@@ -24,7 +25,18 @@ logger = logging.getLogger(__name__)
 
 # Supported assets for market predictions
 SUPPORTED_ASSETS = ["BTC", "ETH"]
-TOPIC_IDS = {"BTC": 14, "ETH": 13}
+TOPIC_IDS: Mapping[str, int] = MappingProxyType({"BTC": 14, "ETH": 13})
+
+# AI sentiment scores for recommendations
+SENTIMENT_SCORES: Mapping[str, int] = MappingProxyType({"bullish": 1, "bearish": -1})
+
+# Sentiment/statistics weights by recommendation time horizon
+HORIZON_WEIGHTS: Mapping[str, Dict[str, float]] = MappingProxyType({
+    "short": {"sentiment": 0.6, "stats": 0.4},   # Short-term: more sentiment
+    "medium": {"sentiment": 0.5, "stats": 0.5},  # Medium-term: balanced
+    "long": {"sentiment": 0.3, "stats": 0.7}     # Long-term: more stats
+})
+DEFAULT_HORIZON_WEIGHTS = {"sentiment": 0.5, "stats": 0.5}
 
 class MarketPredictionParams(BaseModel):
     """Parameters for market prediction"""
@@ -145,12 +157,15 @@ class MarketActionProvider(ActionProvider):
                 }
             
             # Combine insights
+            sentiment = prediction.get("sentiment", "neutral")
+            direction = prediction.get("direction", "sideways")
+            confidence = prediction.get("confidence", 0.5)
             response = {
                 "message": f"Analysis for {asset}:",
                 "prediction": {
-                    "sentiment": prediction.get("sentiment", "neutral"),
-                    "direction": prediction.get("direction", "sideways"),
-                    "confidence": prediction.get("confidence", 0.5),
+                    "sentiment": sentiment,
+                    "direction": direction,
+                    "confidence": confidence,
                 },
                 "statistics": {
                     "volatility": metrics.get("volatility"),
@@ -285,18 +300,15 @@ class MarketActionProvider(ActionProvider):
         confidence = 0
         
         # Use AI prediction for sentiment-based signals
-        sentiment_score = 0
-        if prediction.get("sentiment") == "bullish":
-            sentiment_score = 1
-        elif prediction.get("sentiment") == "bearish":
-            sentiment_score = -1
+        sentiment_score = SENTIMENT_SCORES.get(prediction.get("sentiment"), 0)
             
         # Use statistical metrics for numerical analysis
+        below_median_frequency = metrics.get("below_median_frequency", 0.5)
         stats_score = 0
-        if metrics.get("below_median_frequency", 0.5) < 0.4:
+        if below_median_frequency < 0.4:
             # Price is frequently above median, potential uptrend
             stats_score += 0.5
-        elif metrics.get("below_median_frequency", 0.5) > 0.6:
+        elif below_median_frequency > 0.6:
             # Price is frequently below median, potential downtrend
             stats_score -= 0.5
             
@@ -305,13 +317,7 @@ class MarketActionProvider(ActionProvider):
             stats_score *= 0.7  # Reduce confidence for high volatility
             
         # Time horizon adjustments
-        weight_adjustments = {
-            "short": {"sentiment": 0.6, "stats": 0.4},   # Short-term: more sentiment
-            "medium": {"sentiment": 0.5, "stats": 0.5},  # Medium-term: balanced
-            "long": {"sentiment": 0.3, "stats": 0.7}     # Long-term: more stats
-        }
-        
-        weights = weight_adjustments.get(time_horizon, {"sentiment": 0.5, "stats": 0.5})
+        weights = HORIZON_WEIGHTS.get(time_horizon, DEFAULT_HORIZON_WEIGHTS)
         
         # Combine scores with weights
         # Following Rose Heart's advice on weighting based on time horizon
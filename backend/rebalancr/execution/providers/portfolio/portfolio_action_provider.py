@@ -150,22 +150,20 @@ class PortfolioActionProvider(ActionProvider):
         Rose Heart's dual-system approach.
         """
         try:
-            # Get portfolio data
-            portfolio = await self.db_manager.get_portfolio(params.portfolio_id)
-            
-            # Get sentiment-enhanced analysis from Intelligence Engine
-            analysis = await self.intelligence_engine.analyze_portfolio(
-                user_id=params.user_id,
-                portfolio_id=params.portfolio_id
-            )
-            
-            # Get statistical metrics from Strategy Engine
-            stats = await self.strategy_engine.analyze_portfolio_statistics(params.portfolio_id)
-            
-            # Get performance metrics
-            performance = await self.performance_analyzer.get_portfolio_performance(
-                portfolio_id=params.portfolio_id,
-                include_sentiment_impact=params.include_sentiment
+            # Portfolio data, sentiment-enhanced analysis from the Intelligence
+            # Engine, statistical metrics from the Strategy Engine and
+            # performance metrics are independent, so fetch them together
+            portfolio, analysis, stats, performance = await asyncio.gather(
+                self.db_manager.get_portfolio(params.portfolio_id),
+                self.intelligence_engine.analyze_portfolio(
+                    user_id=params.user_id,
+                    portfolio_id=params.portfolio_id
+                ),
+                self.strategy_engine.analyze_portfolio_statistics(params.portfolio_id),
+                self.performance_analyzer.get_portfolio_performance(
+                    portfolio_id=params.portfolio_id,
+                    include_sentiment_impact=params.include_sentiment
+                )
             )
             
             # Prepare detailed or summary response
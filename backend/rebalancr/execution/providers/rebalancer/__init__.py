@@ -8,13 +8,8 @@ architecture that combines:
 - Validation layer for trade approval
 """
 
-# Don't import directly here
-# from .rebalancer_action_provider import (
-#    rebalancer_action_provider,
-#    RebalancerActionProvider
-# )
-
-# Instead, expose a function that allows late importing
+# The provider module pulls in the intelligence stack, so it is imported
+# only when the factory is first requested
 def get_rebalancer_provider():
     from .rebalancer_action_provider import rebalancer_action_provider
     return rebalancer_action_provider
@@ -4,16 +4,24 @@ RebalancerActionProvider
 Provides actions for portfolio rebalancing, implementing the AgentKit action provider pattern.
 """
 import asyncio
-from datetime import datetime
-import json
+import bisect
+from collections import OrderedDict
+import copy
+import functools
+import hashlib
+import itertools
 import logging
-from typing import Dict, List, Any, Optional, Type, Union, cast, TYPE_CHECKING
-from pydantic import BaseModel, Field, root_validator, validator
-from decimal import Decimal
+import secrets
+import time
+import types
+import weakref
+import numpy as np
+import orjson
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+from pydantic import BaseModel, Field, model_validator
 
 from coinbase_agentkit.action_providers.action_decorator import create_action
 from coinbase_agentkit.action_providers.action_provider import ActionProvider
-from coinbase_agentkit.network import Network
 from coinbase_agentkit.wallet_providers import EvmWalletProvider
 
 # Use TYPE_CHECKING for circular import prevention
@@ -31,7 +39,23 @@ from rebalancr.database.db_manager import DatabaseManager
 logger = logging.getLogger(__name__)
 
 # Supported networks for the rebalancer
-SUPPORTED_NETWORKS = [1, 56, 137, 42161, 10]  # Ethereum, BSC, Polygon, Arbitrum, Optimism
+SUPPORTED_NETWORKS = frozenset({1, 56, 137, 42161, 10})  # Ethereum, BSC, Polygon, Arbitrum, Optimism
+
+# Auto-rebalance check interval in seconds for each frequency
+_FREQUENCY_TO_SECONDS = types.MappingProxyType({
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+    "monthly": 2592000
+})
+
+# Maximum number of analyze-portfolio results kept in memory
+_ANALYSIS_CACHE_SIZE = 128
+
+# Upper bounds (inclusive) of each frequency bucket, used to label a stored
+# check interval; anything above the last bound is monthly
+_FREQUENCY_THRESHOLDS = (3600, 86400, 604800)
+_FREQUENCY_LABELS = ("hourly", "daily", "weekly", "monthly")
 
 class AnalyzePortfolioParams(BaseModel):
     """Parameters for portfolio analysis"""
@@ -39,6 +63,7 @@ class AnalyzePortfolioParams(BaseModel):
     user_id: str = "current_user"
     include_sentiment: bool = True
     include_manipulation_check: bool = True
+    force_validation: bool = False  # Run the reviewer even if no rebalance is needed
     
 class ExecuteRebalanceParams(BaseModel):
     """Parameters for executing a portfolio rebalance"""
@@ -46,12 +71,6 @@ class ExecuteRebalanceParams(BaseModel):
     user_id: str = "current_user"
     dry_run: bool = False  # If True, analyze but don't execute
     max_slippage_percent: float = Field(ge=0.1, le=5.0, default=1.0)
-    
-    @validator('max_slippage_percent')
-    def validate_slippage(cls, v):
-        if v < 0.1 or v > 5.0:
-            raise ValueError('Slippage must be between 0.1% and 5.0%')
-        return v
         
 class SimulateRebalanceParams(BaseModel):
     """Parameters for simulating a portfolio rebalance"""
@@ -59,9 +78,9 @@ class SimulateRebalanceParams(BaseModel):
     user_id: str = "current_user"
     target_allocations: Dict[str, float] = Field(default_factory=dict)
     
-    @root_validator(skip_on_failure=True)
-    def validate_allocations(cls, values):
-        allocations = values.get('target_allocations', {})
+    @model_validator(mode='after')
+    def validate_allocations(self):
+        allocations = self.target_allocations
         if not allocations:
             raise ValueError('Target allocations must be provided')
             
@@ -69,31 +88,19 @@ class SimulateRebalanceParams(BaseModel):
         if abs(total - 1.0) > 0.01:  # Allow small rounding errors
             raise ValueError(f'Target allocations must sum to 1.0 (got {total})')
             
-        return values
+        return self
 
 class GetPerformanceParams(BaseModel):
     """Parameters for getting performance metrics"""
     portfolio_id: Optional[int] = None
     days: int = Field(ge=1, le=365, default=30)
     include_recommendations: bool = True
-    
-    @validator('days')
-    def validate_days(cls, v):
-        if v < 1 or v > 365:
-            raise ValueError('Days must be between 1 and 365')
-        return v
 
 class EnableAutoRebalanceParams(BaseModel):
     """Parameters for enabling automatic rebalancing"""
     portfolio_name: str = "main"
     frequency: str = "daily"  # hourly, daily, weekly, monthly
     max_slippage: float = Field(ge=0.1, le=5.0, default=1.0)
-    
-    @validator('max_slippage')
-    def validate_slippage(cls, v):
-        if v < 0.1 or v > 5.0:
-            raise ValueError('Slippage must be between 0.1% and 5.0%')
-        return v
         
 class DisableAutoRebalanceParams(BaseModel):
     """Parameters for disabling automatic rebalancing"""
@@ -103,6 +110,35 @@ class GetRebalancingStatusParams(BaseModel):
     """Parameters for getting rebalancing status"""
     portfolio_name: str = "main"
 
+class _JSONResult(dict):
+    """Action result dict that encodes itself to JSON once with orjson
+    
+    Tool frameworks stringify action results before handing them to the LLM;
+    __str__ returns the cached orjson encoding instead of the dict repr.
+    """
+    
+    __slots__ = ("_json",)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._json = None
+    
+    def to_json(self) -> bytes:
+        """Encode the result, reusing the bytes from any earlier call"""
+        if self._json is None:
+            self._json = RebalancerActionProvider._encode(self)
+        return self._json
+    
+    def __str__(self) -> str:
+        return self.to_json().decode()
+
+def _json_result(func):
+    """Wrap an async action so its dict result is returned as a _JSONResult"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return _JSONResult(await func(*args, **kwargs))
+    return wrapper
+
 class RebalancerActionProvider(ActionProvider):
     """
     Action provider for portfolio rebalancing
@@ -113,6 +149,14 @@ class RebalancerActionProvider(ActionProvider):
     - Additional validation layer (Trade Reviewer)
     """
     
+    # Serializer for action payloads; handles NumPy scalars/arrays, and falls
+    # back to str() for values like Decimal
+    _encode = staticmethod(lambda obj: orjson.dumps(
+        obj,
+        default=str,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+    ))
+    
     def __init__(
         self,
         wallet_provider: EvmWalletProvider,
@@ -137,6 +181,22 @@ class RebalancerActionProvider(ActionProvider):
         self.context = context or {}
         self.config = config or {}
         
+        # Short-lived caches for portfolio lookups, values are (expires_at, result)
+        self._portfolio_name_cache: Dict[Tuple[str, str], Tuple[float, Optional[int]]] = {}
+        self._portfolio_cache: Dict[int, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        
+        # In-flight get_user_portfolios queries keyed by user ID
+        self._inflight_portfolios: Dict[str, asyncio.Future] = {}
+        
+        # Recent analyze-portfolio results, least recently used first, values
+        # are (expires_at, result); misses for the same key share one lock,
+        # which lives as long as some caller holds or waits on it
+        self._analysis_cache: "OrderedDict[Tuple[str, int, bool, bool, bool], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._analysis_locks: "weakref.WeakValueDictionary[Tuple[str, int, bool, bool, bool], asyncio.Lock]" = weakref.WeakValueDictionary()
+        
+        # Sequence for reproducible simulated tx hashes (config deterministic_sim)
+        self._sim_counter = itertools.count()
+        
     def supports_network(self, network_id: int) -> bool:
         """Check if the network is supported by this provider"""
         return network_id in SUPPORTED_NETWORKS
@@ -146,6 +206,7 @@ class RebalancerActionProvider(ActionProvider):
         description="Analyze a portfolio and provide rebalancing recommendations",
         schema=AnalyzePortfolioParams
     )
+    @_json_result
     async def analyze_portfolio(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze a portfolio and provide recommendations
@@ -153,34 +214,90 @@ class RebalancerActionProvider(ActionProvider):
         This uses the intelligence engine which combines:
         - Allora sentiment analysis (emotional signals)
         - Statistical methods (numerical signals)
+        
+        Reviewer validation only runs when a rebalance is needed; set
+        force_validation to get the reviewer's verdict regardless.
+        """
+        params = AnalyzePortfolioParams.model_validate(args)
+        key = (
+            params.user_id,
+            params.portfolio_id,
+            params.include_sentiment,
+            params.include_manipulation_check,
+            params.force_validation
+        )
+        
+        cached = self._analysis_cache_get(key)
+        if cached is not None:
+            return cached
+        
+        lock = self._analysis_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have filled the entry while we waited
+            cached = self._analysis_cache_get(key)
+            if cached is not None:
+                return cached
+            
+            result = await self._analyze_impl(
+                params.portfolio_id,
+                params.user_id,
+                params.include_sentiment,
+                params.include_manipulation_check,
+                params.force_validation
+            )
+            if "error" not in result:
+                self._analysis_cache_put(key, result)
+            return result
+    
+    async def _analyze_impl(
+        self,
+        portfolio_id: int,
+        user_id: str,
+        include_sentiment: bool = True,
+        include_manipulation_check: bool = True,
+        force_validation: bool = False
+    ) -> Dict[str, Any]:
         """
-        params = AnalyzePortfolioParams(**args)
+        Run the intelligence, strategy and reviewer analysis for a portfolio
         
+        The reviewer is skipped when the intelligence engine reports that no
+        rebalance is needed, since its verdict would go unused; pass
+        force_validation to run it anyway.
+        """
         try:
-            intelligence_results = await self.intelligence_engine.analyze_portfolio(
-                params.user_id, 
-                params.portfolio_id
+            # Market conditions don't depend on the portfolio, so fetch them
+            # while the intelligence engine runs
+            intelligence_results, current_market_condition = await asyncio.gather(
+                self.intelligence_engine.analyze_portfolio(
+                    user_id, 
+                    portfolio_id
+                ),
+                self.strategy_engine.get_market_condition()
             )
+            assets = intelligence_results.get("assets", [])
+            rebalance_needed = intelligence_results.get("rebalance_needed", False)
             
-            # Additional strategy-specific analysis
-            strategy_results = await self.strategy_engine.analyze_portfolio(
-                intelligence_results.get("assets", [])
+            # Strategy-specific analysis and reviewer validation both only need
+            # the assets and market condition, so run them together
+            async def validate():
+                if include_sentiment and (rebalance_needed or force_validation) and len(assets) > 0:
+                    return await self.trade_reviewer.validate_rebalance_plan(
+                        assets,
+                        current_market_condition
+                    )
+                return None
+            
+            strategy_results, validation = await asyncio.gather(
+                self.strategy_engine.analyze_portfolio(assets),
+                validate()
             )
             
             # Get market conditions
-            market_condition = strategy_results.get("market_condition", "normal")
-            
-            # Validate using the reviewer
-            validation = None
-            if params.include_sentiment and len(intelligence_results.get("assets", [])) > 0:
-                validation = await self.trade_reviewer.validate_rebalance_plan(
-                    intelligence_results.get("assets", []),
-                    market_condition
-                )
+            market_condition = strategy_results.get("market_condition", current_market_condition or "normal")
             
             result = {
-                "portfolio_id": params.portfolio_id,
-                "rebalance_needed": intelligence_results.get("rebalance_needed", False),
+                "portfolio_id": portfolio_id,
+                "rebalance_needed": rebalance_needed,
                 "assets": intelligence_results.get("assets", []),
                 "cost_analysis": intelligence_results.get("cost_analysis", {}),
                 "strategy_analysis": {
@@ -196,13 +313,13 @@ class RebalancerActionProvider(ActionProvider):
                     "approval_rate": validation.get("approval_rate", 0),
                     "overall_risk": validation.get("overall_risk", 5)
                 }
-                
+            
             return result
             
         except Exception as e:
             logger.error(f"Error analyzing portfolio: {str(e)}")
             return {
-                "portfolio_id": params.portfolio_id,
+                "portfolio_id": portfolio_id,
                 "error": str(e)
             }
     
@@ -211,6 +328,7 @@ class RebalancerActionProvider(ActionProvider):
         description="Execute a portfolio rebalance based on AI and statistical analysis",
         schema=ExecuteRebalanceParams
     )
+    @_json_result
     async def execute_rebalance(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a portfolio rebalance
@@ -221,16 +339,21 @@ class RebalancerActionProvider(ActionProvider):
         3. Only executing if all components agree
         4. Being cautious about fees (cost-benefit analysis)
         """
-        params = ExecuteRebalanceParams(**args)
+        params = ExecuteRebalanceParams.model_validate(args)
         
         try:
-            # First, analyze the portfolio to get recommendations
-            analysis_result = await self.analyze_portfolio(wallet_provider, {
-                "portfolio_id": params.portfolio_id,
-                "user_id": params.user_id,
-                "include_sentiment": True,
-                "include_manipulation_check": True
-            })
+            # Reuse a recent server-side analyze-portfolio result for the same
+            # user and portfolio, otherwise analyze now
+            analysis_result = self._analysis_cache_get(
+                (params.user_id, params.portfolio_id, True, True, False)
+            )
+            if analysis_result is None:
+                analysis_result = await self._analyze_impl(
+                    params.portfolio_id,
+                    params.user_id,
+                    include_sentiment=True,
+                    include_manipulation_check=True
+                )
             
             # Check if rebalancing is needed
             if not analysis_result.get("rebalance_needed", False):
@@ -261,35 +384,41 @@ class RebalancerActionProvider(ActionProvider):
                     "analysis": analysis_result
                 }
                 
-            # Execute the rebalance trades
+            # Execute the rebalance trades concurrently, capped to avoid
+            # bursting exchange rate limits. This is only safe because
+            # _execute_trade is simulated: real on-chain trades share the
+            # wallet's nonce sequence and need sells to settle first, so they
+            # must run one at a time, sells then buys, as
+            # AgentKitClient._execute_trades does
             trades = analysis_result.get("cost_analysis", {}).get("trades", [])
-            execution_results = []
+            semaphore = asyncio.Semaphore(self.config.get("max_parallel_trades", 8))
             
+            submitted = []
+            tasks = []
             for trade in trades:
-                symbol = trade.get("symbol")
-                amount = trade.get("amount")
-                value = trade.get("value")
-                
-                if amount > 0:
-                    # Buy operation
-                    execution_result = await self._execute_buy(
-                        params.user_id,
-                        symbol,
-                        abs(amount),
-                        params.max_slippage_percent
-                    )
-                elif amount < 0:
-                    # Sell operation
-                    execution_result = await self._execute_sell(
-                        params.user_id,
-                        symbol,
-                        abs(amount),
-                        params.max_slippage_percent
-                    )
-                else:
+                symbol, amount, value = trade["symbol"], trade["amount"], trade.get("value")
+                side = "buy" if amount > 0 else "sell" if amount < 0 else None
+                if side is None:
                     # Skip zero amount trades
                     continue
-                    
+                
+                submitted.append((symbol, amount, value))
+                tasks.append(self._run_limited(semaphore, self._execute_trade(
+                    params.user_id,
+                    symbol,
+                    abs(amount),
+                    side,
+                    params.max_slippage_percent
+                )))
+            
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            execution_results = []
+            for (symbol, amount, value), execution_result in zip(submitted, outcomes):
+                if isinstance(execution_result, Exception):
+                    logger.error(f"Error executing trade for {symbol}: {str(execution_result)}")
+                    execution_result = {"success": False, "error": str(execution_result)}
+                
                 execution_results.append({
                     "symbol": symbol,
                     "amount": amount,
@@ -309,7 +438,15 @@ class RebalancerActionProvider(ActionProvider):
                 })
                 
             # Return the results
-            all_succeeded = all(result.get("success", False) for result in execution_results)
+            successes = np.fromiter(
+                (result["success"] for result in execution_results),
+                dtype=bool,
+                count=len(execution_results)
+            )
+            all_succeeded = bool(successes.all())
+            if successes.any():
+                # Holdings have changed, so cached analyses are stale
+                self._invalidate_analysis(params.portfolio_id)
             return {
                 "portfolio_id": params.portfolio_id,
                 "executed": True,
@@ -331,70 +468,74 @@ class RebalancerActionProvider(ActionProvider):
         description="Simulate a portfolio rebalance with custom allocations",
         schema=SimulateRebalanceParams
     )
+    @_json_result
     async def simulate_rebalance(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Simulate a portfolio rebalance with custom allocations
         
         This is useful for testing different allocation strategies before executing
         """
-        params = SimulateRebalanceParams(**args)
+        params = SimulateRebalanceParams.model_validate(args)
         
         try:
-            # Get current portfolio
-            portfolio = await self.intelligence_engine.get_portfolio(
-                params.user_id,
-                params.portfolio_id
+            # Get current portfolio and market condition concurrently
+            portfolio, market_condition = await asyncio.gather(
+                self.intelligence_engine.get_portfolio(
+                    params.user_id,
+                    params.portfolio_id
+                ),
+                self.strategy_engine.get_market_condition()
             )
             
-            # Calculate trades needed for the target allocations
-            current_values = {
-                asset["symbol"]: asset["value"]
-                for asset in portfolio.get("assets", [])
-            }
-            current_weights = {
-                asset["symbol"]: asset["weight"]
-                for asset in portfolio.get("assets", [])
-            }
+            # Index values, weights and prices by symbol in a single pass
+            current_values = {}
+            current_weights = {}
+            price_map = {}
+            for asset in portfolio.get("assets", []):
+                symbol = asset["symbol"]
+                current_values[symbol] = asset["value"]
+                current_weights[symbol] = asset["weight"]
+                price_map[symbol] = asset.get("price", 0)
             
             # Calculate total portfolio value
             total_value = sum(current_values.values())
             
-            # Calculate trades
-            trades = []
-            for symbol, target_weight in params.target_allocations.items():
-                current_weight = current_weights.get(symbol, 0)
-                current_value = current_values.get(symbol, 0)
-                
-                target_value = total_value * target_weight
-                value_change = target_value - current_value
-                
-                # Get current price
-                current_price = None
-                for asset in portfolio.get("assets", []):
-                    if asset["symbol"] == symbol:
-                        current_price = asset.get("price", 0)
-                        break
-                        
-                if not current_price or current_price <= 0:
-                    # Skip assets with no price data
-                    continue
-                    
-                amount_change = value_change / current_price
-                
-                trades.append({
+            # Align prices, values and weights on the target symbols so the
+            # trade math runs as array operations
+            symbols = list(params.target_allocations)
+            prices = np.array([price_map.get(symbol) or 0 for symbol in symbols], dtype=np.float64)
+            current_value_arr = np.array([current_values.get(symbol, 0) for symbol in symbols], dtype=np.float64)
+            current_weight_arr = np.array([current_weights.get(symbol, 0) for symbol in symbols], dtype=np.float64)
+            target_weight_arr = np.array([params.target_allocations[symbol] for symbol in symbols], dtype=np.float64)
+            
+            # Calculate trades, skipping assets with no price data
+            priced = prices > 0
+            value_change = total_value * target_weight_arr - current_value_arr
+            amount_change = np.divide(value_change, prices, out=np.zeros_like(value_change), where=priced)
+            weight_change = target_weight_arr - current_weight_arr
+            
+            trades = [
+                {
                     "symbol": symbol,
-                    "amount": amount_change,
-                    "value": value_change,
-                    "price": current_price,
-                    "weight_change": target_weight - current_weight
-                })
+                    "amount": amount,
+                    "value": value,
+                    "price": price,
+                    "weight_change": delta_weight
+                }
+                for symbol, amount, value, price, delta_weight, include in zip(
+                    symbols,
+                    amount_change.tolist(),
+                    value_change.tolist(),
+                    prices.tolist(),
+                    weight_change.tolist(),
+                    priced.tolist()
+                )
+                if include
+            ]
                 
             # Calculate estimated costs (fees)
             fee_rate = self.config.get("FEE_RATE", 0.001)  # Default 0.1%
-            estimated_fees = sum(abs(t["value"]) * fee_rate for t in trades)
-            
-            # Get current market condition
-            market_condition = await self.strategy_engine.get_market_condition()
+            estimated_fees = float(np.abs(value_change[priced]).sum() * fee_rate)
             
             # Get validation from reviewer
             validation = await self.trade_reviewer.validate_rebalance_plan(
@@ -428,7 +569,7 @@ class RebalancerActionProvider(ActionProvider):
     )
     async def get_performance(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """Get performance metrics and recommendations"""
-        params = GetPerformanceParams(**args)
+        params = GetPerformanceParams.model_validate(args)
         
         try:
             # Get performance data
@@ -458,19 +599,13 @@ class RebalancerActionProvider(ActionProvider):
     )
     async def enable_auto_rebalance_from_text(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """Enable automatic rebalancing based on natural language request"""
-        params = EnableAutoRebalanceParams(**args)
+        params = EnableAutoRebalanceParams.model_validate(args)
         user_id = self.context.get("user_id", "current_user")
         
         logger.info(f"Enabling auto-rebalance for user {user_id}, portfolio {params.portfolio_name}")
         
         # Convert frequency to check interval
-        interval_mapping = {
-            "hourly": 3600,
-            "daily": 86400,
-            "weekly": 604800,
-            "monthly": 2592000
-        }
-        check_interval = interval_mapping.get(params.frequency.lower(), 86400)  # Default to daily
+        check_interval = _FREQUENCY_TO_SECONDS.get(params.frequency.lower(), 86400)  # Default to daily
         
         # Resolve portfolio name to ID
         portfolio_id = await self._resolve_portfolio_name(user_id, params.portfolio_name)
@@ -480,17 +615,16 @@ class RebalancerActionProvider(ActionProvider):
                 "message": f"Could not find portfolio named '{params.portfolio_name}'"
             }
         
-        # Update portfolio settings - use 1 for true in SQLite
-        updated = await self.db_manager.update_portfolio(
+        # Update portfolio settings
+        updated = await self.db_manager.update_portfolio_auto_rebalance_on(
             portfolio_id,
-            {
-                "auto_rebalance": 1,  # SQLite boolean as integer
-                "max_slippage": params.max_slippage,
-                "check_interval": check_interval
-            }
+            params.max_slippage,
+            check_interval
         )
         
         if updated:
+            self._invalidate_portfolio(user_id, params.portfolio_name, portfolio_id)
+            
             # Get human-readable frequency
             human_frequency = params.frequency.lower()
             return {
@@ -511,7 +645,7 @@ class RebalancerActionProvider(ActionProvider):
     )
     async def disable_auto_rebalance_from_text(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """Disable automatic rebalancing based on natural language request"""
-        params = DisableAutoRebalanceParams(**args)
+        params = DisableAutoRebalanceParams.model_validate(args)
         user_id = self.context.get("user_id", "current_user")
         
         logger.info(f"Disabling auto-rebalance for user {user_id}, portfolio {params.portfolio_name}")
@@ -524,15 +658,11 @@ class RebalancerActionProvider(ActionProvider):
                 "message": f"Could not find portfolio named '{params.portfolio_name}'"
             }
         
-        # Update portfolio settings - use 0 for false in SQLite
-        updated = await self.db_manager.update_portfolio(
-            portfolio_id,
-            {
-                "auto_rebalance": 0  # SQLite boolean as integer
-            }
-        )
+        # Update portfolio settings
+        updated = await self.db_manager.update_portfolio_auto_rebalance_off(portfolio_id)
         
         if updated:
+            self._invalidate_portfolio(user_id, params.portfolio_name, portfolio_id)
             return {
                 "status": "success",
                 "message": f"Automatic rebalancing disabled for your {params.portfolio_name} portfolio."
@@ -550,7 +680,7 @@ class RebalancerActionProvider(ActionProvider):
     )
     async def get_rebalancing_status(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> Dict[str, Any]:
         """Get current rebalancing status for a portfolio"""
-        params = GetRebalancingStatusParams(**args)
+        params = GetRebalancingStatusParams.model_validate(args)
         user_id = self.context.get("user_id", "current_user")
         
         # Resolve portfolio name to ID
@@ -575,15 +705,7 @@ class RebalancerActionProvider(ActionProvider):
         max_slippage = portfolio.get("max_slippage", 1.0)
         
         # Convert check interval to human-readable format
-        frequency = "daily"
-        if check_interval <= 3600:
-            frequency = "hourly"
-        elif check_interval <= 86400:
-            frequency = "daily"
-        elif check_interval <= 604800:
-            frequency = "weekly"
-        else:
-            frequency = "monthly"
+        frequency = _FREQUENCY_LABELS[bisect.bisect_left(_FREQUENCY_THRESHOLDS, check_interval)]
         
         if is_active:
             return {
@@ -597,39 +719,110 @@ class RebalancerActionProvider(ActionProvider):
                 "message": f"Automatic rebalancing is not active for your {params.portfolio_name} portfolio."
             }
     
-    async def _execute_buy(self, user_id: str, symbol: str, amount: float, max_slippage_percent: float) -> Dict[str, Any]:
-        """Execute a buy operation"""
-        # In a real implementation, this would connect to exchange APIs
-        # For the hackathon, simulate a successful transaction
-        await asyncio.sleep(0.5)  # Simulate API call
+    def _analysis_cache_get(self, key: Tuple[str, int, bool, bool, bool]) -> Optional[Dict[str, Any]]:
+        """Look up an unexpired analyze-portfolio result and mark it recently used
         
-        return {
-            "success": True,
-            "tx_hash": f"0x{hash(f'{user_id}_{symbol}_{amount}_{datetime.now().timestamp()}'):#x}",
-            "asset": symbol,
-            "amount": amount,
-            "side": "buy"
-        }
+        Returns a deep copy, so callers can't alter the cached result.
+        """
+        entry = self._analysis_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._analysis_cache[key]
+            return None
+        self._analysis_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _analysis_cache_put(self, key: Tuple[str, int, bool, bool, bool], result: Dict[str, Any]) -> None:
+        """Store a copy of an analyze-portfolio result for analysis_ttl_s seconds (default 15)"""
+        ttl = self.config.get("analysis_ttl_s", 15.0)
+        self._analysis_cache[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+    
+    def _invalidate_analysis(self, portfolio_id: int) -> None:
+        """Drop cached analyze-portfolio results for a portfolio"""
+        for key in [key for key in self._analysis_cache if key[1] == portfolio_id]:
+            del self._analysis_cache[key]
+    
+    async def _run_limited(self, semaphore: asyncio.Semaphore, operation) -> Dict[str, Any]:
+        """Await a trade operation while holding a concurrency slot"""
+        async with semaphore:
+            return await operation
     
-    async def _execute_sell(self, user_id: str, symbol: str, amount: float, max_slippage_percent: float) -> Dict[str, Any]:
-        """Execute a sell operation"""
+    async def _simulate_latency(self) -> None:
+        """Sleep for config sim_latency_s seconds to mimic an exchange call (default 0)"""
+        latency = float(self.config.get("sim_latency_s", 0.0))
+        if latency:
+            await asyncio.sleep(latency)
+    
+    def _simulated_tx_hash(self) -> str:
+        """Generate a 32-byte transaction hash for a simulated trade"""
+        if self.config.get("deterministic_sim"):
+            return "0x" + hashlib.sha256(str(next(self._sim_counter)).encode()).hexdigest()
+        return "0x" + secrets.token_hex(32)
+    
+    async def _execute_trade(
+        self,
+        user_id: str,
+        symbol: str,
+        amount: float,
+        side: str,
+        max_slippage_percent: float
+    ) -> Dict[str, Any]:
+        """Execute a buy or sell operation"""
         # In a real implementation, this would connect to exchange APIs
         # For the hackathon, simulate a successful transaction
-        await asyncio.sleep(0.5)  # Simulate API call
+        await self._simulate_latency()
         
         return {
             "success": True,
-            "tx_hash": f"0x{hash(f'{user_id}_{symbol}_{amount}_{datetime.now().timestamp()}'):#x}",
+            "tx_hash": self._simulated_tx_hash(),
             "asset": symbol,
             "amount": amount,
-            "side": "sell"
+            "side": side
         }
         
+    def _cache_get(self, cache: Dict[Any, Tuple[float, Any]], key: Any) -> Tuple[bool, Any]:
+        """Look up an unexpired cache entry, returning (hit, value)"""
+        entry = cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del cache[key]
+            return False, None
+        return True, value
+    
+    def _cache_put(self, cache: Dict[Any, Tuple[float, Any]], key: Any, value: Any) -> None:
+        """Store a value for portfolio_name_cache_ttl seconds (default 30)"""
+        ttl = self.config.get("portfolio_name_cache_ttl", 30.0)
+        cache[key] = (time.monotonic() + ttl, value)
+    
+    def _invalidate_portfolio(self, user_id: str, portfolio_name: str, portfolio_id: int) -> None:
+        """Drop cached lookups for a portfolio after its settings change"""
+        self._portfolio_name_cache.pop((user_id, portfolio_name.lower()), None)
+        self._portfolio_cache.pop(portfolio_id, None)
+    
     async def _resolve_portfolio_name(self, user_id: str, portfolio_name: str) -> Optional[int]:
         """Helper function to convert portfolio name to ID"""
-        # Get user's portfolios
-        portfolios = await self._get_user_portfolios(user_id)
+        cache_key = (user_id, portfolio_name.lower())
+        hit, portfolio_id = self._cache_get(self._portfolio_name_cache, cache_key)
+        if hit:
+            return portfolio_id
         
+        portfolio_id = self._match_portfolio_name(
+            await self._get_user_portfolios(user_id),
+            portfolio_name
+        )
+        if portfolio_id is not None:
+            self._cache_put(self._portfolio_name_cache, cache_key, portfolio_id)
+        return portfolio_id
+    
+    def _match_portfolio_name(self, portfolios: List[Dict[str, Any]], portfolio_name: str) -> Optional[int]:
+        """Find the ID of the portfolio matching a name"""
         # Look for exact name match
         for portfolio in portfolios:
             if portfolio.get("name", "").lower() == portfolio_name.lower():
@@ -644,15 +837,31 @@ class RebalancerActionProvider(ActionProvider):
     
     async def _get_user_portfolios(self, user_id: str) -> List[Dict[str, Any]]:
         """Get portfolios for a user"""
-        # This should be implemented based on how you retrieve user portfolios
-        # Using your existing db_manager implementation
-        return await self.db_manager.get_user_portfolios(user_id)
+        # Concurrent callers for the same user share one in-flight query
+        task = self._inflight_portfolios.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self.db_manager.get_user_portfolios(user_id))
+            self._inflight_portfolios[user_id] = task
+            task.add_done_callback(
+                lambda done: self._inflight_portfolios.pop(user_id, None)
+                if self._inflight_portfolios.get(user_id) is done else None
+            )
+        
+        # Shield so one caller being cancelled doesn't cancel the shared query
+        return await asyncio.shield(task)
     
     async def _get_portfolio_by_id(self, portfolio_id: int) -> Optional[Dict[str, Any]]:
         """Get portfolio by ID"""
         # This should be implemented based on how you retrieve portfolios
         # Using your existing db_manager implementation
-        return await self.db_manager.get_portfolio(portfolio_id)
+        hit, portfolio = self._cache_get(self._portfolio_cache, portfolio_id)
+        if hit:
+            return portfolio
+        
+        portfolio = await self.db_manager.get_portfolio(portfolio_id)
+        if portfolio:
+            self._cache_put(self._portfolio_cache, portfolio_id, portfolio)
+        return portfolio
 
 def rebalancer_action_provider(
     wallet_provider: EvmWalletProvider,
@@ -0,0 +1,86 @@
+"""
+SQLite checkpoint pool
+
+One writable AsyncSqliteSaver plus a small pool of read-only savers over the
+same database, so history reads don't queue behind agent checkpoint writes.
+"""
+import asyncio
+import contextlib
+import logging
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+logger = logging.getLogger(__name__)
+
+# Applied to the writer connection once it is opened: WAL with NORMAL
+# sync cuts fsyncs per checkpoint write, and the page cache/mmap keep hot
+# conversation pages in memory
+CHECKPOINT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+class AsyncSqliteCheckpointPool:
+    """Single-writer, multi-reader set of AsyncSqliteSavers for one SQLite file
+
+    The pool always opens its own connections, so it can point at a file other
+    components also write to (e.g. DatabaseManager's) without their
+    transactions mixing; WAL lets the connections share the file.
+    """
+
+    def __init__(self, sqlite_path: str, readers: int = 4):
+        self.sqlite_path = str(sqlite_path)
+        # An in-memory database is private to its connection, so reads go to the writer
+        self.readers = 0 if self.sqlite_path == ":memory:" else readers
+        self.writer: Optional[AsyncSqliteSaver] = None
+        self._connections: List[aiosqlite.Connection] = []
+        self._available: asyncio.Queue = asyncio.Queue()
+
+    async def open(self) -> None:
+        """Open the writer, create the checkpoint tables and open the readers"""
+        conn = await aiosqlite.connect(self.sqlite_path)
+        self._connections.append(conn)
+        for pragma in CHECKPOINT_PRAGMAS:
+            await conn.execute(pragma)
+        await conn.commit()
+
+        self.writer = AsyncSqliteSaver(conn)
+        # Readers can't create tables, so the writer sets them up first
+        await self.writer.setup()
+
+        # Read-only URI connections; WAL lets them read while the writer commits
+        uri = f"{Path(self.sqlite_path).resolve().as_uri()}?mode=ro"
+        for _ in range(self.readers):
+            reader_conn = await aiosqlite.connect(uri, uri=True)
+            self._connections.append(reader_conn)
+            reader = AsyncSqliteSaver(reader_conn)
+            reader.is_setup = True
+            self._available.put_nowait(reader)
+
+        logger.info(f"Opened checkpoint pool on {self.sqlite_path} with {self.readers} readers")
+
+    @contextlib.asynccontextmanager
+    async def reader(self) -> AsyncIterator[AsyncSqliteSaver]:
+        """Check out a read-only saver for the duration of the block"""
+        if not self.readers:
+            yield self.writer
+            return
+        saver = await self._available.get()
+        try:
+            yield saver
+        finally:
+            self._available.put_nowait(saver)
+
+    async def close(self) -> None:
+        """Close every connection in the pool"""
+        connections, self._connections = self._connections, []
+        self.writer = None
+        self._available = asyncio.Queue()
+        for conn in connections:
+            await conn.close()
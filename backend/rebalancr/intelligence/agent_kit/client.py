@@ -1,12 +1,18 @@
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import asyncio
 import aiohttp
+import functools
 import logging
-import json
+import numpy as np
+import orjson
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from langchain_core.messages import AIMessage, HumanMessage
 
-from ...config import Settings
+from ...config import STRATEGY_CONFIG, Settings
 
 # Use TYPE_CHECKING for circular imports
 if TYPE_CHECKING:
@@ -15,6 +21,27 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Bounds on the per-user session map: least recently used sessions are
+# dropped past CONVERSATION_CACHE_SIZE, and idle ones after CONVERSATION_TTL seconds
+CONVERSATION_CACHE_SIZE = 10_000
+CONVERSATION_TTL = 3600
+
+# Recommendation inputs: AI sentiment scores, and below-median-frequency
+# and volatility thresholds for the statistical signal
+SENTIMENT_SCORES = {"bullish": 1, "bearish": -1}
+BELOW_MEDIAN_LOW = 0.4
+BELOW_MEDIAN_HIGH = 0.6
+HIGH_VOLATILITY = 0.8
+
+@dataclass(slots=True)
+class _UserSession:
+    """Per-user session state held by AgentKitClient"""
+    conversation_id: Optional[str] = None
+    # Monotonic time after which the conversation is dropped
+    expires_at: float = 0.0
+    # Serializes initialization so concurrent calls create one conversation
+    init_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
 # Client Layer (business logic)
 #     ↓ calls
 # Service Layer (send_message)
@@ -48,28 +75,69 @@ class AgentKitClient:
         return cls._instance
     
     def __init__(self, config: Settings, intelligence_engine=None, agent_manager=None):
-        """Initialize the client with references to required services."""
-        # Import service here to avoid circular dependency 
-        from .service import AgentKitService
+        """Initialize the client with references to required services.
+        
+        The AgentKit service and domain-specific services are created on
+        first use, so constructing the client opens no network resources.
+        """
+        self.config = config
         
-        # Get the service singleton
-        self.service = AgentKitService.get_instance(config)
+        # Pooled HTTP session shared by this client's outbound calls, opened on first use
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # Store agent manager (will be set later if None)
         self.agent_manager = agent_manager
         
-        # Initialize domain-specific services
-        from ..allora.client import AlloraClient
-        from ..market_analysis import MarketAnalyzer
-        
-        self.allora_client = AlloraClient(api_key=config.ALLORA_API_KEY)
-        self.market_analyzer = MarketAnalyzer()
-        
         # Initialize intelligence engine reference
         self.intelligence_engine = intelligence_engine
         
-        # Store conversations by user
-        self.conversations = {}
+        # Session state by user, least recently used first
+        self.sessions: "OrderedDict[str, _UserSession]" = OrderedDict()
+        
+        # Structured chat actions by intent
+        self._chat_action_handlers = {
+            "get_market_prediction": self._handle_market_prediction,
+            "rebalance_portfolio": self._handle_portfolio_rebalance,
+        }
+        
+    @functools.cached_property
+    def service(self):
+        """The AgentKitService singleton"""
+        # Import service here to avoid circular dependency 
+        from .service import AgentKitService
+        return AgentKitService.get_instance(self.config)
+    
+    @functools.cached_property
+    def allora_client(self):
+        """Allora client for market predictions, sharing this client's HTTP session"""
+        from ..allora.client import AlloraClient
+        return AlloraClient(api_key=self.config.ALLORA_API_KEY, session=self._get_session())
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, opening it on the running loop on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    @functools.cached_property
+    def market_analyzer(self):
+        """Market analyzer for statistical signals"""
+        from ..market_analysis import MarketAnalyzer
+        return MarketAnalyzer()
         
     def set_intelligence_engine(self, intelligence_engine: "IntelligenceEngine"):
         """Set the intelligence engine after initialization"""
@@ -80,17 +148,58 @@ class AgentKitClient:
         self.agent_manager = agent_manager
         
     async def initialize_session(self, user_id):
-        """Initialize a new conversation and agent for a user"""
-        # Create conversation
-        #conversation = await self.agent_manager.db_manager.create_conversation(user_id)
-        #self.conversations[user_id] = conversation.id
-        conversation_id = "123"
-        # Ensure wallet is initialized (through manager)
-        await self.agent_manager.initialize_agent_for_user(user_id)
-        logger.info(f"Initialized session and agent for user {user_id}")
-        
-        #return conversation.id
-        return conversation_id
+        """Initialize a new conversation and agent for a user
+        
+        Returns the user's live session if one exists. Concurrent calls for
+        the same user wait for a single initialization.
+        """
+        session = self._user_session(user_id)
+        conversation_id = self._live_conversation(session)
+        if conversation_id is not None:
+            return conversation_id
+        
+        async with session.init_lock:
+            conversation_id = self._live_conversation(session)
+            if conversation_id is not None:
+                return conversation_id
+            
+            # Create conversation
+            #conversation = await self.agent_manager.db_manager.create_conversation(user_id)
+            conversation_id = "123"
+            # Ensure wallet is initialized (through manager)
+            await self.agent_manager.initialize_agent_for_user(user_id)
+            session.conversation_id = conversation_id
+            session.expires_at = time.monotonic() + CONVERSATION_TTL
+            logger.info(f"Initialized session and agent for user {user_id}")
+            
+            #return conversation.id
+            return conversation_id
+    
+    def _user_session(self, user_id: str) -> _UserSession:
+        """Get a user's session state, marking it recently used
+        
+        Creates it if missing, evicting the least recently used past the cap.
+        """
+        session = self.sessions.get(user_id)
+        if session is None:
+            session = self.sessions[user_id] = _UserSession()
+            while len(self.sessions) > CONVERSATION_CACHE_SIZE:
+                self.sessions.popitem(last=False)
+        else:
+            self.sessions.move_to_end(user_id)
+        return session
+    
+    @staticmethod
+    def _live_conversation(session: _UserSession) -> Optional[str]:
+        """Get the session's conversation id if unexpired, extending its TTL"""
+        if session.conversation_id is None:
+            return None
+        now = time.monotonic()
+        if now >= session.expires_at:
+            session.conversation_id = None
+            return None
+        session.expires_at = now + CONVERSATION_TTL
+        return session.conversation_id
     
     async def get_agent_response(self, user_id, message, session_id=None):
         """
@@ -117,12 +226,10 @@ class AgentKitClient:
         a direct entry point for UI components and API endpoints.
         """
         # Handle different intents with domain-specific logic
-        if intent == "get_market_prediction":
-            return await self._handle_market_prediction(user_id, parameters)
-        elif intent == "rebalance_portfolio":
-            return await self._handle_portfolio_rebalance(user_id, parameters)
-        else:
+        handler = self._chat_action_handlers.get(intent)
+        if handler is None:
             return {"error": f"Unknown intent: {intent}"}
+        return await handler(user_id, parameters)
     
     async def execute_trade(self, user_id, params):
         """
@@ -140,7 +247,8 @@ class AgentKitClient:
         # Execute the trade via the AgentManager
         async with self.agent_manager.get_agent_executor(user_id) as agent:
             # Format the trade request
-            trade_message = f"Execute trade: Buy {params.get('amount')} of {params.get('asset')}"
+            side = params.get("action", "buy").capitalize()
+            trade_message = f"Execute trade: {side} {params.get('amount')} of {params.get('asset')}"
             
             # Execute the trade
             result = await agent.ainvoke({"messages": [trade_message]})
@@ -148,7 +256,7 @@ class AgentKitClient:
             # Process the result
             return {
                 "success": True,
-                "transaction_id": "tx_" + str(hash(str(result))),
+                "transaction_id": f"tx_{uuid.uuid4().hex}",
                 "details": result
             }
     
@@ -184,7 +292,7 @@ class AgentKitClient:
                 result = await agent.ainvoke({
                     "messages": [{
                         "role": "user",
-                        "content": f"Analyze my portfolio with address {wallet_address} and execute a rebalance with these parameters: {json.dumps(parameters)}"
+                        "content": f"Analyze my portfolio with address {wallet_address} and execute a rebalance with these parameters: {orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS).decode()}"
                     }]
                 })
                 
@@ -201,25 +309,46 @@ class AgentKitClient:
         # This is a placeholder
         return "0x123456789abcdef"
     
-    async def _execute_trades(self, user_id, trades):
-        """Execute a set of trades for portfolio rebalancing"""
-        results = []
-        for asset, amount in trades.items():
-            if amount > 0:  # Buy
-                params = {
-                    "asset": asset,
-                    "amount": abs(amount),
-                    "action": "buy"
-                }
-            else:  # Sell
-                params = {
-                    "asset": asset,
-                    "amount": abs(amount),
-                    "action": "sell"
-                }
-            result = await self.execute_trade(user_id, params)
-            results.append(result)
-        return results
+    async def _execute_trades(self, user_id, trades, portfolio_value=None):
+        """Execute a set of trades for portfolio rebalancing
+        
+        Given the portfolio's total value, priced trades worth no more than
+        the fee on it (FEE_RATE of portfolio_value) are skipped, since
+        rebalancing dust costs more than it corrects.
+        
+        Nothing calls this yet: _handle_portfolio_rebalance goes through the
+        agent, and _get_current_prices is still a placeholder, so the
+        deadband only takes effect once a caller passes portfolio_value
+        alongside real prices.
+        """
+        if portfolio_value is not None:
+            prices = await self._get_current_prices(list(trades))
+            deadband = STRATEGY_CONFIG.get("FEE_RATE", 0.001) * portfolio_value
+            skipped = [
+                asset for asset, amount in trades.items()
+                if asset in prices and abs(amount) * prices[asset] <= deadband
+            ]
+            if skipped:
+                logger.info(f"Skipping rebalance trades below ${deadband:.2f} fee breakeven: {skipped}")
+                trades = {asset: amount for asset, amount in trades.items() if asset not in skipped}
+        
+        params_list = [
+            {
+                "asset": asset,
+                "amount": abs(amount),
+                "action": "buy" if amount > 0 else "sell"
+            }
+            for asset, amount in trades.items()
+        ]
+        
+        # Trades share the user's wallet and its nonce sequence, so they run
+        # one at a time; sells go first so buys can spend their proceeds
+        results = {}
+        for action in ("sell", "buy"):
+            for i, params in enumerate(params_list):
+                if params["action"] == action:
+                    results[i] = await self.execute_trade(user_id, params)
+        return [results[i] for i in range(len(params_list))]
     
     async def _get_user_portfolio(self, wallet_address):
         """Get user's current portfolio holdings"""
@@ -240,49 +369,78 @@ class AgentKitClient:
         return [{"price": 60000, "timestamp": "2023-01-01"}]
     
     def _generate_recommendation(self, prediction, metrics):
-        """Generate a recommendation combining AI sentiment and statistical metrics"""
-        recommendation = "HOLD"
-        confidence = 0
+        """Generate a recommendation combining AI sentiment and statistical metrics
+        
+        The result only depends on the sentiment and on which side of the
+        below-median and volatility thresholds the metrics fall, so it is
+        memoized on those.
+        """
+        sentiment = prediction.get("sentiment")
+        below_median_frequency = metrics.get("below_median_frequency", 0.5)
+        return dict(self._recommendation_for(
+            sentiment if sentiment in SENTIMENT_SCORES else None,
+            -1 if below_median_frequency < BELOW_MEDIAN_LOW else 1 if below_median_frequency > BELOW_MEDIAN_HIGH else 0,
+            metrics.get("volatility", 0.5) > HIGH_VOLATILITY
+        ))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _recommendation_for(sentiment: Optional[str], below_median_side: int, high_volatility: bool) -> Dict[str, Any]:
+        """Score one representative asset per (sentiment, threshold sides) combination"""
+        below_median_frequency = {-1: 0.0, 0: 0.5, 1: 1.0}[below_median_side]
+        return AgentKitClient._generate_recommendations_bulk(
+            [{"sentiment": sentiment}],
+            [{"below_median_frequency": below_median_frequency, "volatility": 1.0 if high_volatility else 0.0}]
+        )[0]
+    
+    @staticmethod
+    def _generate_recommendations_bulk(predictions: List[Dict[str, Any]], metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate recommendations for many assets at once
         
+        Scores every asset in one pass over NumPy arrays; predictions[i] and
+        metrics[i] describe the same asset.
+        """
         # Use AI prediction for sentiment-based signals
-        sentiment_score = 0
-        if prediction.get("sentiment") == "bullish":
-            sentiment_score = 1
-        elif prediction.get("sentiment") == "bearish":
-            sentiment_score = -1
-            
-        # Use statistical metrics for numerical analysis
-        stats_score = 0
-        if metrics.get("below_median_frequency", 0.5) < 0.4:
-            # Price is frequently above median, potential uptrend
-            stats_score += 0.5
-        elif metrics.get("below_median_frequency", 0.5) > 0.6:
-            # Price is frequently below median, potential downtrend
-            stats_score -= 0.5
-            
+        sentiment_scores = np.fromiter(
+            (SENTIMENT_SCORES.get(prediction.get("sentiment"), 0) for prediction in predictions),
+            dtype=float, count=len(predictions)
+        )
+        
+        # Use statistical metrics for numerical analysis: price frequently
+        # above median is a potential uptrend, frequently below a downtrend
+        below_median_frequency = np.fromiter(
+            (m.get("below_median_frequency", 0.5) for m in metrics), dtype=float, count=len(metrics)
+        )
+        volatility = np.fromiter((m.get("volatility", 0.5) for m in metrics), dtype=float, count=len(metrics))
+        stats_scores = np.select(
+            [below_median_frequency < BELOW_MEDIAN_LOW, below_median_frequency > BELOW_MEDIAN_HIGH],
+            [0.5, -0.5],
+            default=0.0
+        )
+        
         # Volatility check - lower score for high volatility
-        if metrics.get("volatility", 0.5) > 0.8:
-            stats_score *= 0.7  # Reduce confidence for high volatility
-            
+        stats_scores = np.where(volatility > HIGH_VOLATILITY, stats_scores * 0.7, stats_scores)
+        
         # Combine scores with weights
         # Following Rose Heart's advice on starting with equal weights
-        final_score = (sentiment_score * 0.5) + (stats_score * 0.5)
-        
-        if final_score > 0.3:
-            recommendation = "BUY"
-            confidence = min(abs(final_score) * 100, 100)
-        elif final_score < -0.3:
-            recommendation = "SELL"
-            confidence = min(abs(final_score) * 100, 100)
-        else:
-            recommendation = "HOLD"
-            confidence = max(0, (1 - abs(final_score)) * 100)
-            
-        return {
-            "action": recommendation,
-            "confidence": confidence,
-            "reasoning": f"Combined AI sentiment ({sentiment_score}) and statistical signals ({stats_score})"
-        }
+        final_scores = (sentiment_scores * 0.5) + (stats_scores * 0.5)
+        
+        actions = np.select([final_scores > 0.3, final_scores < -0.3], ["BUY", "SELL"], default="HOLD")
+        confidences = np.where(
+            actions == "HOLD",
+            np.maximum(0, (1 - np.abs(final_scores)) * 100),
+            np.minimum(np.abs(final_scores) * 100, 100)
+        )
+        
+        return [
+            {
+                "action": str(action),
+                "confidence": float(confidence),
+                "reasoning": f"Combined AI sentiment ({sentiment_score:g}) and statistical signals ({stats_score:g})"
+            }
+            for action, confidence, sentiment_score, stats_score
+            in zip(actions, confidences, sentiment_scores, stats_scores)
+        ]
 
     # Add streaming support method
     async def stream_agent_response(self, user_id, message, conversation_id=None):
@@ -305,14 +463,10 @@ class AgentKitClient:
                 input={"messages": [HumanMessage(content=message)]},
                 config={"configurable": {"thread_id": f"{user_id}-{conversation_id}"}}
             ):
-                # Handle agent responses
-                if "agent" in chunk:
-                    content = chunk["agent"]["messages"][0].content
-                    last_content = content  # Track the last content
-                    yield chunk
-                # Handle other chunk types
-                else:
-                    yield chunk
+                # Track the last agent content; every chunk type is passed through
+                if (agent := chunk.get("agent")) is not None:
+                    last_content = agent["messages"][0].content
+                yield chunk
         
         # After streaming complete, store the response if we got any content
         if last_content:
@@ -9,13 +9,20 @@ from langchain_deepseek import ChatDeepSeek
 
 from coinbase_agentkit_langchain import get_langchain_tools
 from langchain_openai import ChatOpenAI
+import httpx
 from rebalancr.execution.providers.kuru import kuru_action_provider
 from rebalancr.execution.providers.market_action import market_action_provider
 from ...config import Settings
+import importlib.util
 import logging
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent LLM calls multiplex over one connection, but httpx
+# only supports it with the optional h2 package installed
+LLM_HTTP2 = importlib.util.find_spec("h2") is not None
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
 # Client Layer (business logic)
 #     ↓ calls
 # Service Layer (send_message)
@@ -83,10 +90,14 @@ class AgentKitService:
         #     timeout=None,
         # )
         
+        # One keep-alive connection pool for every LLM call in the process
+        self.http_client = httpx.AsyncClient(http2=LLM_HTTP2, limits=LLM_HTTP_LIMITS)
+        
         # For LangChain integration
         self.llm = ChatOpenAI(
             model=config.OPENAI_MODEL or "gpt-4o-mini",
-            api_key=config.OPENAI_API_KEY
+            api_key=config.OPENAI_API_KEY,
+            http_async_client=self.http_client
         )
         self.tools = get_langchain_tools(self.agent_kit)
         
@@ -108,6 +119,10 @@ class AgentKitService:
     def get_agent_kit(self):
         """Get the shared AgentKit instance"""
         return self.agent_kit
+    
+    async def close(self):
+        """Close the shared LLM HTTP client"""
+        await self.http_client.aclose()
 
     def _get_base_action_providers(self):
         """Get the base action providers without circular dependencies"""
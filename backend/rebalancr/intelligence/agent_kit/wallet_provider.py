@@ -1,12 +1,16 @@
 """Privy server wallet provider compatible with AgentKit."""
 
+import asyncio
 import json
 import os
+import time
 import uuid
+import weakref
 import requests
 import logging
+import orjson
 from decimal import Decimal
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Tuple, Union
 from web3 import Web3
 from web3.types import BlockIdentifier, ChecksumAddress, HexStr, TxParams
 
@@ -16,9 +20,13 @@ from coinbase_agentkit.network import Network
 
 from pydantic import BaseModel, Field
 from ...config import get_settings
+from ...utils.http import get_pooled_session
 
 logger = logging.getLogger(__name__)
 
+# Seconds a wallet verified against Privy is reused before checking again
+WALLET_CACHE_TTL = 60.0
+
 # Configuration class for Privy wallet provider
 class PrivyProviderConfig(BaseModel):
     """Base configuration for Privy providers."""
@@ -86,7 +94,8 @@ class PrivyWalletProvider(EvmWalletProvider):
         # Setup API and data directories
         self.base_url = "https://api.privy.io/v1"
         self.wallet_data_dir = os.path.join(settings.DATA_DIR, "wallets")
-        os.makedirs(self.wallet_data_dir, exist_ok=True)
+        if not os.path.isdir(self.wallet_data_dir):
+            os.makedirs(self.wallet_data_dir, exist_ok=True)
         
         # Get chain ID from network ID
         #chain_id = self._get_chain_id_from_network_id(config.network_id)
@@ -97,7 +106,7 @@ class PrivyWalletProvider(EvmWalletProvider):
 
         #chain_id = "monad_testnet"
         rpc_url = "https://testnet-rpc.monad.xyz"
-        self._web3 = Web3(Web3.HTTPProvider(rpc_url))
+        self._web3 = Web3(Web3.HTTPProvider(rpc_url, session=get_pooled_session()))
         
         # Initialize network object (matches CDP wallet provider)
         self._network = Network(
@@ -109,6 +118,11 @@ class PrivyWalletProvider(EvmWalletProvider):
         # Initialize wallet-related attributes
         self._wallet_data = None
         self._address = None
+        # user_id -> (expires_at, wallet data) for wallets recently verified or created
+        self._verified_wallets: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Per-user locks so concurrent callers don't each create a wallet; an
+        # entry lives as long as some caller holds or waits on its lock
+        self._wallet_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
         
         # Set gas configuration from config or defaults
         self._gas_limit_multiplier = (
@@ -200,18 +214,30 @@ class PrivyWalletProvider(EvmWalletProvider):
         """Get path for storing wallet data for a user"""
         return os.path.join(self.wallet_data_dir, f"wallet-{user_id}.json")
     
+    @staticmethod
+    def _read_wallet_file(wallet_path: str) -> Dict[str, Any]:
+        with open(wallet_path, "rb") as f:
+            return orjson.loads(f.read())
+    
+    @staticmethod
+    def _write_wallet_file(wallet_path: str, data: bytes) -> None:
+        with open(wallet_path, "wb") as f:
+            f.write(data)
+    
     async def load_wallet_data(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Load wallet data for a user"""
         wallet_path = self._get_wallet_path(user_id)
         
-        if os.path.exists(wallet_path):
-            try:
-                with open(wallet_path, "r") as f:
-                    wallet_data = json.load(f)
-                logger.info(f"Loaded wallet data for user {user_id}")
-                return wallet_data
-            except Exception as e:
-                logger.error(f"Error loading wallet data for user {user_id}: {str(e)}")
+        try:
+            # Read off the event loop so other users' requests aren't blocked
+            wallet_data = await asyncio.to_thread(self._read_wallet_file, wallet_path)
+            logger.info(f"Loaded wallet data for user {user_id}")
+            return wallet_data
+        except FileNotFoundError:
+            # No wallet saved for this user yet
+            pass
+        except Exception as e:
+            logger.error(f"Error loading wallet data for user {user_id}: {str(e)}")
         
         return None
     
@@ -220,8 +246,8 @@ class PrivyWalletProvider(EvmWalletProvider):
         wallet_path = self._get_wallet_path(user_id)
         
         try:
-            with open(wallet_path, "w") as f:
-                json.dump(wallet_data, f, indent=2)
+            data = orjson.dumps(wallet_data, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(self._write_wallet_file, wallet_path, data)
             logger.info(f"Saved wallet data for user {user_id}")
         except Exception as e:
             logger.error(f"Error saving wallet data for user {user_id}: {str(e)}")
@@ -256,6 +282,7 @@ class PrivyWalletProvider(EvmWalletProvider):
             
             wallet_data = response.json()
             await self.save_wallet_data(user_id, wallet_data)
+            self._remember_wallet(user_id, wallet_data)
             
             # Set wallet data for this instance if it's the first wallet
             if not self._wallet_data:
@@ -269,8 +296,42 @@ class PrivyWalletProvider(EvmWalletProvider):
             logger.error(f"Error creating Privy wallet: {str(e)}")
             raise
     
+    def _remember_wallet(self, user_id: str, wallet_data: Dict[str, Any]) -> None:
+        """Cache a user's wallet for WALLET_CACHE_TTL seconds"""
+        self._verified_wallets[user_id] = (time.monotonic() + WALLET_CACHE_TTL, wallet_data)
+    
+    def _cached_wallet(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a user's wallet if it was verified or created within WALLET_CACHE_TTL"""
+        cached = self._verified_wallets.get(user_id)
+        if cached is None:
+            return None
+        expires_at, wallet_data = cached
+        if time.monotonic() < expires_at:
+            return wallet_data
+        del self._verified_wallets[user_id]
+        return None
+    
     async def get_or_create_wallet(self, user_id: str) -> Dict[str, Any]:
-        """Get existing wallet or create a new one for the user"""
+        """Get existing wallet or create a new one for the user
+        
+        A wallet verified or created within the last WALLET_CACHE_TTL seconds
+        is returned without touching the wallet file or the Privy API.
+        Concurrent calls for the same user wait for a single lookup, so a
+        new user gets exactly one wallet.
+        """
+        wallet_data = self._cached_wallet(user_id)
+        if wallet_data is not None:
+            return wallet_data
+        
+        lock = self._wallet_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            wallet_data = self._cached_wallet(user_id)
+            if wallet_data is not None:
+                return wallet_data
+            return await self._load_or_create_wallet(user_id)
+    
+    async def _load_or_create_wallet(self, user_id: str) -> Dict[str, Any]:
+        """Verify the user's stored wallet with Privy, creating one if needed"""
         wallet_data = await self.load_wallet_data(user_id)
         
         if not wallet_data or not wallet_data.get('id'):
@@ -305,6 +366,7 @@ class PrivyWalletProvider(EvmWalletProvider):
             
             # Update local wallet data
             await self.save_wallet_data(user_id, wallet_data)
+            self._remember_wallet(user_id, wallet_data)
             
             return wallet_data
         except Exception as e:
@@ -649,7 +711,7 @@ class PrivyWalletProvider(EvmWalletProvider):
                 'value': prepared_tx.get('value', 0),
                 'data': prepared_tx.get('data', b'')
             })
-            prepared_tx['gas'] = int(gas_estimate * self._gas_limit_multiplier)
+            prepared_tx['gas'] = self.gas_limit_for(gas_estimate)
         
         # For EIP-1559 transactions
         if 'maxFeePerGas' not in prepared_tx or 'maxPriorityFeePerGas' not in prepared_tx:
@@ -664,23 +726,25 @@ class PrivyWalletProvider(EvmWalletProvider):
             
         return prepared_tx
     
-    def _estimate_fees(self):
-        """Estimate gas fees for a transaction"""
-        def get_base_fee():
-            latest_block = self._web3.eth.get_block("latest")
-            base_fee = latest_block["baseFeePerGas"]
-            return int(base_fee * self._fee_per_gas_multiplier)
-
-        def get_max_priority_fee():
-            max_priority_fee_per_gas = Web3.to_wei(0.1, "gwei")
-            return int(max_priority_fee_per_gas * self._fee_per_gas_multiplier)
-
-        base_fee_per_gas = get_base_fee()
-        max_priority_fee_per_gas = get_max_priority_fee()
-        max_fee_per_gas = base_fee_per_gas + max_priority_fee_per_gas
+    def gas_limit_for(self, gas_estimate: int) -> int:
+        """Get the gas limit sent for an estimated gas amount"""
+        return int(gas_estimate * self._gas_limit_multiplier)
 
+    def fees_for_base_fee(self, base_fee_per_gas: int) -> Tuple[int, int]:
+        """Get (max priority fee, max fee) per gas for a block's base fee
+        
+        Callers that fetch the base fee themselves (e.g. in a batched RPC
+        call) use this to price transactions the same way send_transaction does.
+        """
+        max_priority_fee_per_gas = int(Web3.to_wei(0.1, "gwei") * self._fee_per_gas_multiplier)
+        max_fee_per_gas = int(base_fee_per_gas * self._fee_per_gas_multiplier) + max_priority_fee_per_gas
         return (max_priority_fee_per_gas, max_fee_per_gas)
 
+    def _estimate_fees(self):
+        """Estimate gas fees for a transaction"""
+        latest_block = self._web3.eth.get_block("latest")
+        return self.fees_for_base_fee(latest_block["baseFeePerGas"])
+
 # Helper functions to maintain compatibility with the existing codebase
 def get_wallet_provider() -> PrivyWalletProvider:
     """Get the wallet provider instance"""
@@ -1,54 +1,93 @@
 import asyncio
 import aiohttp
+import orjson
 import time
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 from datetime import datetime
 
+# Allora topic IDs by "<asset>_<timeframe>" key
+TOPIC_MAP: Mapping[str, int] = MappingProxyType({
+    # Short-term predictions (5min)
+    "ETH_5min": 13,
+    "BTC_5min": 14,
+    "ETH_5min_volatility": 15,
+    "BTC_5min_volatility": 16,
+    
+    # Medium-term predictions
+    "ETH_10min": 1,
+    "BTC_10min": 3,
+    "SOL_10min": 5,
+    "ETH_20min": 7,
+    "BNB_20min": 8,
+    "ARB_20min": 9,
+    
+    # Long-term predictions (24h)
+    "ETH_24h": 2,
+    "BTC_24h": 4,
+    "SOL_24h": 6,
+    
+    # Special topics
+    "MEME_1h": 10
+})
+
+# Default topic arguments by topic key, per the topic documentation
+TOPIC_DEFAULT_ARGS: Mapping[str, str] = MappingProxyType({
+    "ETH_5min": "ETH",
+    "BTC_5min": "BTC",
+    "ETH_10min": "ETH",
+    # ... add others as needed
+})
+
 class AlloraClient:
-    """Client for interacting with Allora Network APIs"""
+    """Client for interacting with Allora Network APIs
     
-    def __init__(self, api_key: str, base_url: str = "https://api.allora.network"):
+    Pass session to share a pooled aiohttp session with other clients;
+    otherwise the client opens its own on first use.
+    """
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.allora.network",
+                 session: Optional[aiohttp.ClientSession] = None):
         self.api_key = api_key
         self.base_url = base_url
-        self.session = None
-        self.topic_map = {
-            # Short-term predictions (5min)
-            "ETH_5min": 13,
-            "BTC_5min": 14,
-            "ETH_5min_volatility": 15,
-            "BTC_5min_volatility": 16,
-            
-            # Medium-term predictions
-            "ETH_10min": 1,
-            "BTC_10min": 3,
-            "SOL_10min": 5,
-            "ETH_20min": 7,
-            "BNB_20min": 8,
-            "ARB_20min": 9,
-            
-            # Long-term predictions (24h)
-            "ETH_24h": 2,
-            "BTC_24h": 4,
-            "SOL_24h": 6,
-            
-            # Special topics
-            "MEME_1h": 10
+        self.session = session
+        # Only sessions this client opened itself are closed by it
+        self._owns_session = session is None
+        # Sent per request, so a shared session needs no Allora defaults
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
         }
+        self.topic_map = TOPIC_MAP
         # Add caching to reduce API calls
         self.cache = {}
         self.cache_expiry = {}
         self.default_cache_ttl = 300  # 5 minutes in seconds
+        # Prediction fetches in progress, so concurrent misses for a topic share one request
+        self._inflight: Dict[str, asyncio.Future] = {}
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(headers={
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        })
+        self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session, opening a keep-alive one on the running loop if needed"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=20, keepalive_timeout=30, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+            self._owns_session = True
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session if this client opened it"""
+        if self._owns_session and self.session is not None:
             await self.session.close()
+            self.session = None
             
     async def get_prediction(self, topic_id: int) -> Dict[str, Any]:
         """
@@ -65,25 +104,33 @@ class AlloraClient:
         cached_data = self._get_from_cache(cache_key)
         if cached_data:
             return cached_data
-
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            })
-            
+        
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_prediction(topic_id, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(
+                lambda done: self._inflight.pop(cache_key, None)
+                if self._inflight.get(cache_key) is done else None
+            )
+        
+        # Shield so one caller being cancelled doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+    
+    async def _fetch_prediction(self, topic_id: int, cache_key: str) -> Dict[str, Any]:
+        """Fetch the latest prediction for a topic from the API and cache it"""
         url = f"{self.base_url}/v1/topics/{topic_id}/predictions/latest"
         try:
-            async with self.session.get(url) as response:
+            async with self._get_session().get(url, headers=self.headers) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     # Add to cache with default TTL
                     self._add_to_cache(cache_key, result)
                     return result
                 elif response.status == 429:  # Rate limited
                     # Implement exponential backoff
                     await asyncio.sleep(2)
-                    return await self.get_prediction(topic_id)
+                    return await self._fetch_prediction(topic_id, cache_key)
                 else:
                     error_text = await response.text()
                     raise Exception(f"Failed to get prediction: {error_text}")
@@ -207,20 +254,14 @@ class AlloraClient:
         if cached_data:
             return cached_data
             
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            })
-            
         url = f"{self.base_url}/v1/sentiment/analyze"
         try:
-            async with self.session.post(url, json={
+            async with self._get_session().post(url, headers=self.headers, data=orjson.dumps({
                 "asset": asset,
                 "content": content
-            }) as response:
+            })) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     
                     # Extract fear/greed signals as Rose Heart suggested
                     fear_score = result.get("fear_score", 0.5)
@@ -267,14 +308,7 @@ class AlloraClient:
         
         # Use default arg if none provided
         if arg is None:
-            # Default args based on the topic documentation
-            default_args = {
-                "ETH_5min": "ETH",
-                "BTC_5min": "BTC",
-                "ETH_10min": "ETH",
-                # ... add others as needed
-            }
-            arg = default_args.get(topic_key, "")
+            arg = TOPIC_DEFAULT_ARGS.get(topic_key, "")
             
         return await self.get_prediction(topic_id)
         
@@ -96,8 +96,8 @@ class MarketDataAnalyzer:
             logger.error("Market service not initialized")
             return {"error": "Market service not initialized"}
             
-        data1 = await self.market_service.get_historical_prices(symbol1, days)
-        data2 = await self.market_service.get_historical_prices(symbol2, days)
+        histories = await self.market_service.get_historical_prices_batch([symbol1, symbol2], days)
+        data1, data2 = histories[symbol1], histories[symbol2]
         
         if not data1 or not data2:
             return {"correlation": 0, "relationship": "unknown"}
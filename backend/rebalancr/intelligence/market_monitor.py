@@ -5,6 +5,9 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Assets refreshed concurrently, so upstream APIs aren't hit by every asset at once
+MARKET_FETCH_CONCURRENCY = 10
+
 class MarketMonitor:
     """
     Monitors overall market conditions and sentiment.
@@ -17,6 +20,7 @@ class MarketMonitor:
         self.market_data_service = market_data_service
         self.allora_client = allora_client
         self.market_metrics = {}
+        self._fetch_semaphore = asyncio.Semaphore(MARKET_FETCH_CONCURRENCY)
         
     async def start_monitoring(self, assets: List[str], interval_seconds: int = 300):
         """Start continuous market monitoring"""
@@ -30,18 +34,25 @@ class MarketMonitor:
             await asyncio.sleep(interval_seconds)
     
     async def update_market_metrics(self, assets: List[str]):
-        """Update market metrics for tracked assets"""
-        for asset in assets:
+        """Update market metrics for tracked assets, several at a time"""
+        await asyncio.gather(*(self._update_asset_metrics(asset) for asset in assets))
+    
+    async def _get_sentiment(self, asset: str) -> Dict[str, Any]:
+        """Get sentiment analysis of an asset's social content"""
+        social_content = await self.market_data_service.get_social_content(asset)
+        return await self.allora_client.analyze_sentiment(asset, social_content)
+    
+    async def _update_asset_metrics(self, asset: str):
+        """Update market metrics for one asset"""
+        async with self._fetch_semaphore:
             try:
-                # Get market data
-                market_data = await self.market_data_service.get_market_data(asset)
-                
-                # Get sentiment analysis (as before)
-                social_content = await self.market_data_service.get_social_content(asset)
-                sentiment = await self.allora_client.analyze_sentiment(asset, social_content)
-                
-                # NEW: Get Allora price predictions
-                predictions = await self.get_price_predictions(asset)
+                # Get market data, sentiment analysis (as before) and Allora
+                # price predictions together; none depends on another
+                market_data, sentiment, predictions = await asyncio.gather(
+                    self.market_data_service.get_market_data(asset),
+                    self._get_sentiment(asset),
+                    self.get_price_predictions(asset)
+                )
                 
                 # Calculate statistical metrics (as before)
                 price_data = pd.DataFrame(market_data.get("prices", []))
@@ -270,12 +281,15 @@ class MarketMonitor:
             return result
         
         # Get predictions for each timeframe
-        for topic in topics:
-            try:
-                prediction = await self.allora_client.get_topic_prediction(topic)
+        predictions = await asyncio.gather(
+            *(self.allora_client.get_topic_prediction(topic) for topic in topics),
+            return_exceptions=True
+        )
+        for topic, prediction in zip(topics, predictions):
+            if isinstance(prediction, Exception):
+                logger.error(f"Error getting prediction for {topic}: {str(prediction)}")
+            else:
                 result[topic] = prediction
-            except Exception as e:
-                logger.error(f"Error getting prediction for {topic}: {str(e)}")
             
         return result
 
@@ -4,16 +4,51 @@ Trade Reviewer Service
 This module provides a second opinion on trade decisions,
 implementing the multi-layered architecture from the Allora HyperLiquid AutoTradeBot example.
 """
-import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import time
+import orjson
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 import aiohttp
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Instructions sent ahead of every external review. Kept byte-identical
+# across calls, with all trade data in the user message, so providers can
+# reuse their cached prefix.
+REVIEW_SYSTEM_PROMPT = """As an AI trading expert, review potential trades.
+
+Please analyze each trade based on Rose Heart's trading principles:
+1. Use sentiment for emotional analysis
+2. Use statistics for numerical decisions
+3. Beware of high volatility
+4. Pay attention to market manipulation
+5. Consider if benefits outweigh costs
+
+Respond in JSON format with:
+1. approval (true/false)
+2. confidence (0-100)
+3. reasoning (string, one or two sentences)
+4. risk_score (1-10)"""
+
+# Completion budget per reviewed trade; a verdict with brief reasoning fits
+# well inside it, and batched calls get one budget per trade
+REVIEW_MAX_TOKENS = 200
+
+# Most external reviews kept for reuse; identical review requests inside the
+# TTL get the stored verdict instead of another LLM call
+_REVIEW_CACHE_SIZE = 256
+
+# Rule-based rejections at or above this confidence are final and never
+# reach the external AI
+_DECISIVE_RULE_CONFIDENCE = 85.0
+
+# Assets the rule-based review treats as reserves that shouldn't be sold down
+STABLECOINS = frozenset({"USDC", "USDT", "DAI"})
+
 class ReviewRequest(BaseModel):
     """Request for trade review"""
     asset: str
@@ -49,6 +84,8 @@ class TradeReviewer:
         self.use_external_ai = self.config.get("USE_EXTERNAL_AI", False)
         self.api_key = self.config.get("REVIEWER_API_KEY", "")
         self.api_url = self.config.get("REVIEWER_API_URL", "")
+        self.json_mode = self.config.get("REVIEWER_JSON_MODE", True)
+        self._review_cache: "OrderedDict[Tuple, Tuple[float, ReviewResult]]" = OrderedDict()
         
     async def review_trade(self, trade_data: Dict[str, Any]) -> ReviewResult:
         """
@@ -62,70 +99,175 @@ class TradeReviewer:
         """
         try:
             # Convert to ReviewRequest for validation
-            request = ReviewRequest(
-                asset=trade_data.get("asset", ""),
-                current_price=trade_data.get("current_price", 0),
-                predicted_price=trade_data.get("predicted_price"),
-                prediction_diff_pct=trade_data.get("prediction_diff_pct"),
-                direction=trade_data.get("direction", "maintain"),
-                market_condition=trade_data.get("market_condition", "normal"),
-                sentiment=trade_data.get("sentiment"),
-                volatility=trade_data.get("volatility"),
-                manipulation_risk=trade_data.get("manipulation_risk"),
-                below_median_frequency=trade_data.get("below_median_frequency")
-            )
+            request = self._to_request(trade_data)
             
             # Use external AI if configured
-            if self.use_external_ai and self.api_key and self.api_url:
+            if self._external_ai_enabled():
                 return await self._external_review(request)
             else:
                 # Otherwise use rule-based review
                 return await self._rule_based_review(request)
                 
         except Exception as e:
-            logger.error(f"Review failed: {str(e)}")
-            return ReviewResult(
-                asset=trade_data.get("asset", "unknown"),
-                approval=False,
-                confidence=0.0,
-                reasoning=f"Review failed: {str(e)}",
-                risk_score=10  # Maximum risk on failure
-            )
+            return self._failed_review(trade_data, e)
+    
+    def _to_request(self, trade_data: Dict[str, Any]) -> ReviewRequest:
+        """Validate trade data into a ReviewRequest"""
+        return ReviewRequest(
+            asset=trade_data.get("asset", ""),
+            current_price=trade_data.get("current_price", 0),
+            predicted_price=trade_data.get("predicted_price"),
+            prediction_diff_pct=trade_data.get("prediction_diff_pct"),
+            direction=trade_data.get("direction", "maintain"),
+            market_condition=trade_data.get("market_condition", "normal"),
+            sentiment=trade_data.get("sentiment"),
+            volatility=trade_data.get("volatility"),
+            manipulation_risk=trade_data.get("manipulation_risk"),
+            below_median_frequency=trade_data.get("below_median_frequency")
+        )
+    
+    def _failed_review(self, trade_data: Dict[str, Any], error: Exception) -> ReviewResult:
+        """Maximum-risk rejection for a trade that couldn't be reviewed"""
+        logger.error(f"Review failed: {str(error)}")
+        return ReviewResult(
+            asset=trade_data.get("asset", "unknown"),
+            approval=False,
+            confidence=0.0,
+            reasoning=f"Review failed: {str(error)}",
+            risk_score=10  # Maximum risk on failure
+        )
+    
+    def _external_ai_enabled(self) -> bool:
+        """Whether reviews go to the external AI service"""
+        return bool(self.use_external_ai and self.api_key and self.api_url)
+    
+    async def _post_review(self, prompt: str, trades: int = 1) -> str:
+        """Send a review prompt for the given number of trades to the external AI service and return the reply text"""
+        async with aiohttp.ClientSession() as session:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            data = {
+                "model": "claude-3",  # Use Claude 3 or GPT-4
+                "messages": [
+                    {"role": "system", "content": REVIEW_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.3,
+                "max_tokens": self.config.get("REVIEWER_MAX_TOKENS", REVIEW_MAX_TOKENS) * trades
+            }
+            if self.json_mode:
+                # Constrain decoding to a JSON object so replies always parse
+                data["response_format"] = {"type": "json_object"}
+            
+            async with session.post(self.api_url, headers=headers, json=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                else:
+                    error = await response.text()
+                    raise Exception(f"API error: {error}")
     
     async def _external_review(self, request: ReviewRequest) -> ReviewResult:
         """Use external AI service for review"""
+        screened = await self._prescreen(request)
+        if screened is not None:
+            return screened
+        
         prompt = self._create_review_prompt(request)
         
-        async with aiohttp.ClientSession() as session:
+        try:
+            content = await self._post_review(prompt)
+        except Exception as e:
+            logger.error(f"External review failed: {str(e)}")
+            # Fall back to rule-based review
+            return await self._rule_based_review(request)
+        
+        try:
+            result = self._review_from_dict(self._extract_json(content), request.asset)
+        except Exception as e:
+            return self._unparsed_review(request.asset, e)
+        self._review_cache_put(request, result)
+        return result
+    
+    async def _external_bulk_review(self, requests: List[ReviewRequest]) -> List[ReviewResult]:
+        """Review several trades with one external AI call
+        
+        Trades with a cached review or a decisive rule-based rejection are
+        answered locally. Falls back to one call per trade if the batched
+        reply can't be matched up with the requests.
+        """
+        results = [await self._prescreen(request) for request in requests]
+        pending = [request for request, result in zip(requests, results) if result is None]
+        
+        if len(pending) == 1:
+            reviewed = [await self._external_review(pending[0])]
+        elif pending:
+            prompt = self._create_bulk_review_prompt(pending)
             try:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                data = {
-                    "model": "claude-3",  # Use Claude 3 or GPT-4
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.3
-                }
-                
-                async with session.post(self.api_url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                        return self._parse_analysis(content, request.asset)
-                    else:
-                        error = await response.text()
-                        raise Exception(f"API error: {error}")
+                content = await self._post_review(prompt, trades=len(pending))
+                reviewed = self._parse_bulk_analysis(content, pending)
             except Exception as e:
-                logger.error(f"External review failed: {str(e)}")
-                # Fall back to rule-based review
-                return await self._rule_based_review(request)
+                logger.warning(f"Batched external review failed, reviewing trades individually: {str(e)}")
+                reviewed = await asyncio.gather(*(self._external_review(request) for request in pending))
+            else:
+                for request, result in zip(pending, reviewed):
+                    self._review_cache_put(request, result)
+        else:
+            return results
+        
+        fresh = iter(reviewed)
+        return [result if result is not None else next(fresh) for result in results]
+    
+    async def _prescreen(self, request: ReviewRequest) -> Optional[ReviewResult]:
+        """Answer a review without the external AI when possible
+        
+        Returns the rule-based review for "maintain" actions, which place no
+        trade, or when the rules reject the trade with high confidence;
+        otherwise a cached external review, or None if the external AI is
+        needed.
+        """
+        rule_result = await self._rule_based_review(request)
+        if request.direction == "maintain":
+            return rule_result
+        
+        cached = self._review_cache_get(request)
+        if cached is not None:
+            return cached
+        
+        threshold = self.config.get("REVIEWER_DECISIVE_CONFIDENCE", _DECISIVE_RULE_CONFIDENCE)
+        if not rule_result.approval and rule_result.confidence >= threshold:
+            return rule_result
+        return None
+    
+    def _review_cache_get(self, request: ReviewRequest) -> Optional[ReviewResult]:
+        """Look up an unexpired external review for an identical request"""
+        key = tuple(request.model_dump().values())
+        entry = self._review_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._review_cache[key]
+            return None
+        self._review_cache.move_to_end(key)
+        return result
+    
+    def _review_cache_put(self, request: ReviewRequest, result: ReviewResult) -> None:
+        """Store an external review for REVIEWER_CACHE_TTL seconds (default 600)"""
+        ttl = self.config.get("REVIEWER_CACHE_TTL", 600)
+        key = tuple(request.model_dump().values())
+        self._review_cache[key] = (time.monotonic() + ttl, result)
+        self._review_cache.move_to_end(key)
+        while len(self._review_cache) > _REVIEW_CACHE_SIZE:
+            self._review_cache.popitem(last=False)
     
     def _create_review_prompt(self, request: ReviewRequest) -> str:
-        """Create prompt for AI review"""
+        """Create the trade details for AI review"""
         return f"""
-        As an AI trading expert, review this potential trade:
+        Review this potential trade:
         
         Asset: {request.asset}
         Current Price: ${request.current_price:,.2f}
@@ -137,52 +279,67 @@ class TradeReviewer:
         {"Volatility: " + str(request.volatility) if request.volatility else ""}
         {"Manipulation Risk: " + str(request.manipulation_risk) if request.manipulation_risk else ""}
         {"Below Median Frequency: " + str(request.below_median_frequency) if request.below_median_frequency else ""}
+        """
+    
+    def _create_bulk_review_prompt(self, requests: List[ReviewRequest]) -> str:
+        """Create one prompt asking for a review of every trade in a plan"""
+        trades = "\n".join(
+            f"Trade {i + 1}:\n{self._create_review_prompt(request)}"
+            for i, request in enumerate(requests)
+        )
+        return f"""
+        Review each of the following {len(requests)} trades independently.
+        {trades}
         
-        Please analyze this trade based on Rose Heart's trading principles:
-        1. Use sentiment for emotional analysis
-        2. Use statistics for numerical decisions
-        3. Beware of high volatility
-        4. Pay attention to market manipulation
-        5. Consider if benefits outweigh costs
-        
-        Respond in JSON format with:
-        1. approval (true/false)
-        2. confidence (0-100)
-        3. reasoning (string)
-        4. risk_score (1-10)
+        Respond in JSON format with a "reviews" array holding one object per
+        trade, in the same order, each with the fields requested in the
+        instructions.
         """
     
-    def _parse_analysis(self, analysis: str, asset: str) -> ReviewResult:
-        """Parse AI response into ReviewResult"""
-        try:
-            # Find JSON block in the response
-            start = analysis.find('{')
-            end = analysis.rfind('}')
-            
-            # Ensure valid JSON bounds
-            if start == -1 or end == -1:
-                raise ValueError("No valid JSON found in the response")
-                
-            json_str = analysis[start:end + 1]  # Extract JSON substring
-            result_dict = json.loads(json_str)
+    def _parse_bulk_analysis(self, analysis: str, requests: List[ReviewRequest]) -> List[ReviewResult]:
+        """Parse a batched AI response into one ReviewResult per request"""
+        reviews = self._extract_json(analysis).get("reviews")
+        if not isinstance(reviews, list) or len(reviews) != len(requests):
+            raise ValueError("Batched response doesn't match the number of trades")
+        
+        return [
+            self._review_from_dict(review, request.asset)
+            for request, review in zip(requests, reviews)
+        ]
+    
+    def _extract_json(self, analysis: str) -> Dict[str, Any]:
+        """Decode the outermost JSON object in an AI response"""
+        # Find JSON block in the response
+        start = analysis.find('{')
+        end = analysis.rfind('}')
+        
+        # Ensure valid JSON bounds
+        if start == -1 or end == -1:
+            raise ValueError("No valid JSON found in the response")
             
-            # Convert to ReviewResult
-            return ReviewResult(
-                asset=asset,
-                approval=result_dict.get("approval", False),
-                confidence=float(result_dict.get("confidence", 0.0)),
-                reasoning=result_dict.get("reasoning", ""),
-                risk_score=int(result_dict.get("risk_score", 10))
-            )
-        except Exception as e:
-            logger.error(f"Failed to parse AI response: {str(e)}")
-            return ReviewResult(
-                asset=asset,
-                approval=False,
-                confidence=0.0,
-                reasoning=f"Failed to parse AI response: {str(e)}",
-                risk_score=10
-            )
+        json_str = analysis[start:end + 1]  # Extract JSON substring
+        return orjson.loads(json_str)
+    
+    def _review_from_dict(self, result_dict: Dict[str, Any], asset: str) -> ReviewResult:
+        """Convert one decoded review object to a ReviewResult"""
+        return ReviewResult(
+            asset=asset,
+            approval=result_dict.get("approval", False),
+            confidence=float(result_dict.get("confidence", 0.0)),
+            reasoning=result_dict.get("reasoning", ""),
+            risk_score=int(result_dict.get("risk_score", 10))
+        )
+    
+    def _unparsed_review(self, asset: str, error: Exception) -> ReviewResult:
+        """Maximum-risk rejection for an AI response that couldn't be parsed"""
+        logger.error(f"Failed to parse AI response: {str(error)}")
+        return ReviewResult(
+            asset=asset,
+            approval=False,
+            confidence=0.0,
+            reasoning=f"Failed to parse AI response: {str(error)}",
+            risk_score=10
+        )
     
     async def _rule_based_review(self, request: ReviewRequest) -> ReviewResult:
         """
@@ -227,7 +384,7 @@ class TradeReviewer:
             reasons.append("Asset frequently trades below median - avoid increasing position")
         
         # 5. Special case for stablecoins
-        if request.asset in ["USDC", "USDT", "DAI"] and request.direction == "decrease":
+        if request.asset in STABLECOINS and request.direction == "decrease":
             approval = False
             confidence = 85.0
             risk_score = 7
@@ -245,9 +402,29 @@ class TradeReviewer:
         )
         
     async def bulk_review(self, trades: List[Dict[str, Any]]) -> List[ReviewResult]:
-        """Review multiple trades in parallel"""
-        tasks = [self.review_trade(trade) for trade in trades]
-        return await asyncio.gather(*tasks)
+        """Review multiple trades in parallel
+        
+        With the external AI enabled, all valid trades go out in a single
+        batched request instead of one request per trade.
+        """
+        if not self._external_ai_enabled() or len(trades) < 2:
+            tasks = [self.review_trade(trade) for trade in trades]
+            return await asyncio.gather(*tasks)
+        
+        results: List[Optional[ReviewResult]] = [None] * len(trades)
+        requests = []
+        positions = []
+        for i, trade in enumerate(trades):
+            try:
+                requests.append(self._to_request(trade))
+                positions.append(i)
+            except Exception as e:
+                results[i] = self._failed_review(trade, e)
+        
+        if requests:
+            for i, result in zip(positions, await self._external_bulk_review(requests)):
+                results[i] = result
+        return results
         
     async def validate_rebalance_plan(
         self, 
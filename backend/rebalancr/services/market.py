@@ -1,11 +1,26 @@
 import aiohttp
 import asyncio
 import logging
+import orjson
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per chunk from API response bodies
+RESPONSE_CHUNK_SIZE = 32_768
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Parse a JSON response body read in chunks
+    
+    Chunks go into one buffer that orjson parses in place, so a large listing
+    holds a single copy of the body instead of its chunks plus a joined copy.
+    """
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(RESPONSE_CHUNK_SIZE):
+        body += chunk
+    return orjson.loads(body)
+
 class MarketDataService:
     """Service for fetching market data from various sources"""
     
@@ -15,6 +30,11 @@ class MarketDataService:
         self.api_key = config.CMC_API_KEY if hasattr(config, "CMC_API_KEY") else None
         self.cache = {}
         self.cache_timeout = 300  # Cache timeout in seconds (5 minutes)
+        self.historical_cache_timeout = 3600  # Daily bars barely move within an hour
+        # Token quotes up to this many seconds past cache_timeout are served
+        # stale while a background refresh fetches the new ones
+        self.stale_timeout = 300
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
         
     async def get_token_price(self, symbol: str) -> Optional[float]:
         """Get current price for a token by symbol"""
@@ -51,7 +71,7 @@ class MarketDataService:
                 url = f"{self.base_url}/global-metrics/quotes/latest"
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await _read_json(response)
                         result = data.get("data", {})
                         
                         # Cache the result
@@ -84,7 +104,7 @@ class MarketDataService:
                 url = f"{self.base_url}/cryptocurrency/listings/latest?limit={limit}"
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await _read_json(response)
                         result = data.get("data", [])
                         
                         # Cache the result
@@ -98,15 +118,72 @@ class MarketDataService:
             return []
     
     async def _fetch_token_data(self, symbol: str) -> Dict[str, Any]:
-        """Fetch data for a specific token (internal helper)"""
+        """Fetch data for a specific token (internal helper)
+        
+        Slightly stale quotes are returned straight away and refreshed in
+        the background, so only a cold or long-expired cache waits on the API.
+        """
         cache_key = f"token_{symbol.upper()}"
         
         # Check cache first
+        cache_data = self._cached_token_data(symbol, cache_key)
+        if cache_data is not None:
+            return cache_data
+        
+        return await self._request_token_data(symbol, cache_key)
+    
+    def _cached_token_data(self, symbol: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached quote that is fresh or within the stale window
+        
+        Stale quotes trigger a background refresh.
+        """
         if cache_key in self.cache:
             cache_time, cache_data = self.cache[cache_key]
-            if datetime.now() - cache_time < timedelta(seconds=self.cache_timeout):
+            age = datetime.now() - cache_time
+            if age < timedelta(seconds=self.cache_timeout):
+                return cache_data
+            if age < timedelta(seconds=self.cache_timeout + self.stale_timeout):
+                self._refresh_token_data(symbol, cache_key)
                 return cache_data
+        return None
+    
+    async def get_tokens_data(self, symbols: List[str]) -> Dict[str, Any]:
+        """Get token data for several symbols with at most one API request
         
+        Returns:
+            Token data keyed by upper-case symbol, as in get_token_data; symbols
+            the API didn't return are missing
+        """
+        result: Dict[str, Any] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            cache_data = self._cached_token_data(symbol, f"token_{symbol}")
+            if cache_data is None:
+                missing.append(symbol)
+            else:
+                result.update(cache_data)
+        
+        if missing:
+            # The quotes endpoint takes a comma-separated symbol list
+            data = await self._request_token_data(",".join(missing), None)
+            now = datetime.now()
+            for symbol in missing:
+                if symbol in data:
+                    # Cache each symbol on its own so single-token lookups hit it
+                    self.cache[f"token_{symbol}"] = (now, {symbol: data[symbol]})
+                    result[symbol] = data[symbol]
+        return result
+    
+    def _refresh_token_data(self, symbol: str, cache_key: str):
+        """Start a background refresh of a token's quote unless one is running"""
+        if cache_key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._request_token_data(symbol, cache_key))
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda done: self._refresh_tasks.pop(cache_key, None))
+    
+    async def _request_token_data(self, symbol: str, cache_key: Optional[str]) -> Dict[str, Any]:
+        """Request token quotes from the API, caching them under cache_key if given"""
         try:
             async with aiohttp.ClientSession() as session:
                 headers = {
@@ -117,11 +194,12 @@ class MarketDataService:
                 url = f"{self.base_url}/cryptocurrency/quotes/latest?symbol={symbol.upper()}"
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await _read_json(response)
                         result = data.get("data", {})
                         
                         # Cache the result
-                        self.cache[cache_key] = (datetime.now(), result)
+                        if cache_key is not None:
+                            self.cache[cache_key] = (datetime.now(), result)
                         return result
                     else:
                         logger.error(f"API error: {response.status}")
@@ -130,15 +208,23 @@ class MarketDataService:
             logger.error(f"Error fetching token data for {symbol}: {str(e)}")
             return {}
 
+    def _cached_historical_prices(self, symbol: str, days: int) -> Optional[List[Dict[str, Any]]]:
+        """Get a token's cached historical prices, or None if missing or expired"""
+        cache_key = f"historical_{symbol.upper()}_{days}"
+        if cache_key in self.cache:
+            cache_time, cache_data = self.cache[cache_key]
+            if datetime.now() - cache_time < timedelta(seconds=self.historical_cache_timeout):
+                return cache_data
+        return None
+
     async def get_historical_prices(self, symbol: str, days: int = 30) -> List[Dict[str, Any]]:
         """Get historical price data for a token"""
         cache_key = f"historical_{symbol.upper()}_{days}"
         
         # Check cache first
-        if cache_key in self.cache:
-            cache_time, cache_data = self.cache[cache_key]
-            if datetime.now() - cache_time < timedelta(seconds=self.cache_timeout):
-                return cache_data
+        cache_data = self._cached_historical_prices(symbol, days)
+        if cache_data is not None:
+            return cache_data
         
         try:
             # For proper historical data, you might need a different API
@@ -152,6 +238,22 @@ class MarketDataService:
             logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
             return []
     
+    async def get_historical_prices_batch(self, symbols: List[str], days: int = 30) -> Dict[str, List[Dict[str, Any]]]:
+        """Get historical price data for several tokens
+        
+        Quotes for the symbols without a fresh cached series are fetched in
+        one request up front, so those series are built from cache; a symbol
+        missing from the batched response falls back to its own request.
+        
+        Returns:
+            Historical prices keyed by the symbols as given
+        """
+        stale = [symbol for symbol in symbols if self._cached_historical_prices(symbol, days) is None]
+        if stale:
+            await self.get_tokens_data(stale)
+        histories = await asyncio.gather(*(self.get_historical_prices(symbol, days) for symbol in symbols))
+        return dict(zip(symbols, histories))
+    
     async def _generate_dummy_historical_data(self, symbol: str, days: int) -> List[Dict[str, Any]]:
         """Generate dummy historical data for demonstration purposes"""
         # In a real implementation, you would fetch this from an API
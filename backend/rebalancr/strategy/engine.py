@@ -85,11 +85,12 @@ class StrategyEngine:
         This provides metrics for the Intelligence Engine to consume.
         """
         try:
-            # Get portfolio data
-            portfolio = await self.db_manager.get_portfolio(portfolio_id)
-            
-            # Get risk assessment - purely statistical as Rose Heart advised
-            risk_assessment = await self.risk_manager.assess_portfolio_risk(portfolio_id)
+            # Get portfolio data alongside the risk assessment - purely
+            # statistical as Rose Heart advised
+            portfolio, risk_assessment = await asyncio.gather(
+                self.db_manager.get_portfolio(portfolio_id),
+                self.risk_manager.assess_portfolio_risk(portfolio_id)
+            )
             
             # Calculate asset metrics
             asset_metrics = await self._calculate_asset_metrics(portfolio)
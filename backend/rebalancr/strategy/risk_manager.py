@@ -4,6 +4,10 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Asset categories used for the correlation estimate
+CRYPTO_ASSETS = frozenset({"BTC", "ETH", "SOL", "ADA"})
+STABLECOINS = frozenset({"USDC", "USDT", "DAI"})
+
 class RiskManager:
     """
     Manages portfolio risk based on statistical metrics.
@@ -125,8 +129,8 @@ class RiskManager:
         # In a real system, this would calculate actual correlations
         
         # Count how many assets are in each category
-        crypto_count = sum(1 for asset in assets if asset.get("symbol") in ["BTC", "ETH", "SOL", "ADA"])
-        stablecoin_count = sum(1 for asset in assets if asset.get("symbol") in ["USDC", "USDT", "DAI"])
+        crypto_count = sum(1 for asset in assets if asset.get("symbol") in CRYPTO_ASSETS)
+        stablecoin_count = sum(1 for asset in assets if asset.get("symbol") in STABLECOINS)
         
         total_assets = len(assets)
         if total_assets <= 1:
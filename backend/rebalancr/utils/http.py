@@ -0,0 +1,32 @@
+"""Shared HTTP sessions"""
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session for all JSON-RPC traffic, created on first use
+_POOLED_SESSION: Optional[requests.Session] = None
+
+def get_pooled_session() -> requests.Session:
+    """Get the shared connection-pooled HTTP session for RPC requests
+    
+    Pass it to Web3.HTTPProvider(session=...) so every RPC call reuses
+    open TCP/TLS connections instead of paying a handshake each time.
+    
+    Returns:
+        Shared requests session
+    """
+    global _POOLED_SESSION
+    if _POOLED_SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.1)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _POOLED_SESSION = session
+    return _POOLED_SESSION
@@ -2,6 +2,7 @@ from typing import Dict, List, Any, Optional, Set
 from fastapi import WebSocket
 import json
 import logging
+import orjson
 
 
 logger = logging.getLogger(__name__)
@@ -20,56 +21,71 @@ class WebSocketManager:
         
     async def connect(self, websocket: WebSocket, user_id: str):
         """Connect a new WebSocket client"""
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            connections = self.active_connections[user_id] = []
             self.topic_subscriptions[user_id] = set()
             
-        self.active_connections[user_id].append(websocket)
+        connections.append(websocket)
         logger.info(f"Client connected: {user_id}")
     
     async def disconnect(self, websocket: WebSocket, user_id: str):
         """Disconnect a specific client connection"""
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
+        connections = self.active_connections.get(user_id)
+        if connections is not None:
+            if websocket in connections:
+                connections.remove(websocket)
                 logger.info(f"Client connection removed: {user_id}")
                 
             # Clean up if no more connections
-            if not self.active_connections[user_id]:
+            if not connections:
                 del self.active_connections[user_id]
-                if user_id in self.topic_subscriptions:
-                    del self.topic_subscriptions[user_id]
+                self.topic_subscriptions.pop(user_id, None)
                 logger.info(f"Client fully disconnected: {user_id}")
     
     def subscribe_to_topics(self, user_id: str, topics: List[str]):
         """Subscribe a user to specified topics"""
-        if user_id not in self.topic_subscriptions:
-            self.topic_subscriptions[user_id] = set()
-        
-        self.topic_subscriptions[user_id].update(topics)
+        subscriptions = self.topic_subscriptions.setdefault(user_id, set())
+        subscriptions.update(topics)
         logger.info(f"User {user_id} subscribed to topics: {topics}")
-        return list(self.topic_subscriptions[user_id])
+        return list(subscriptions)
     
     def unsubscribe_from_topics(self, user_id: str, topics: List[str]):
         """Unsubscribe a user from specified topics"""
-        if user_id in self.topic_subscriptions:
-            self.topic_subscriptions[user_id].difference_update(topics)
-            logger.info(f"User {user_id} unsubscribed from topics: {topics}")
-        return list(self.topic_subscriptions[user_id])
+        subscriptions = self.topic_subscriptions.get(user_id)
+        if subscriptions is None:
+            return []
+        subscriptions.difference_update(topics)
+        logger.info(f"User {user_id} unsubscribed from topics: {topics}")
+        return list(subscriptions)
+                
+    @staticmethod
+    def _encode(message: Any) -> str:
+        """Serialize a message once for every connection it goes to"""
+        if isinstance(message, dict):
+            # Same compact encoding WebSocket.send_json uses
+            try:
+                return orjson.dumps(message).decode()
+            except TypeError:
+                # e.g. non-string keys or integers wider than 64 bits
+                return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return str(message)
                 
     async def send_personal_message(self, message: Any, user_id: str):
         """Send message to all connections of a specific user"""
-        if user_id not in self.active_connections:
+        await self._send_encoded(self._encode(message), user_id)
+    
+    async def _send_encoded(self, text: str, user_id: str):
+        """Send an already-serialized message to all connections of a user"""
+        connections = self.active_connections.get(user_id)
+        if connections is None:
             logger.warning(f"Attempted to send message to non-connected user: {user_id}")
             return
             
         failed_connections = []
-        for connection in self.active_connections[user_id]:
+        for connection in connections:
             try:
-                if isinstance(message, dict):
-                    await connection.send_json(message)
-                else:
-                    await connection.send_text(str(message))
+                await connection.send_text(text)
             except Exception as e:
                 logger.error(f"Error sending message to {user_id}: {str(e)}")
                 failed_connections.append(connection)
@@ -80,13 +96,7 @@ class WebSocketManager:
                 
     async def broadcast(self, message: Any):
         """Broadcast message to all connected users"""
-        # Prepare message based on type
-        if isinstance(message, dict):
-            json_message = json.dumps(message)
-            is_json = True
-        else:
-            json_message = str(message)
-            is_json = False
+        text = self._encode(message)
             
         # Track users with failed connections for cleanup
         users_to_cleanup = {}
@@ -95,10 +105,7 @@ class WebSocketManager:
             failed_connections = []
             for connection in connections:
                 try:
-                    if is_json:
-                        await connection.send_json(json_message)
-                    else:
-                        await connection.send_text(json_message)
+                    await connection.send_text(text)
                 except Exception as e:
                     logger.error(f"Broadcast error to {user_id}: {str(e)}")
                     failed_connections.append(connection)
@@ -128,9 +135,10 @@ class WebSocketManager:
         
         logger.info(f"Broadcasting to topic {topic}: {len(subscribed_users)} recipients")
         
-        # Send to each subscribed user
+        # Serialize once and send to each subscribed user
+        text = self._encode(message_with_topic)
         for user_id in subscribed_users:
-            await self.send_personal_message(message_with_topic, user_id)
+            await self._send_encoded(text, user_id)
 
 # Global websocket manager instance
 websocket_manager = WebSocketManager()
\ No newline at end of file
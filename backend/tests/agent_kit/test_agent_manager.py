@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from rebalancr.intelligence.agent_kit import agent_manager
+from rebalancr.intelligence.agent_kit.agent_manager import AgentManager
+
+
+async def _noop():
+    pass
+
+
+def _manager(store_messages_bulk):
+    """AgentManager with only the message queue wired up, around a fake history manager"""
+    manager = AgentManager.__new__(AgentManager)
+    manager._msg_queue = asyncio.Queue()
+    manager._flusher_task = None
+    manager._background_tasks = set()
+    manager._checkpoint_pool = None
+    manager.history_manager = SimpleNamespace(store_messages_bulk=store_messages_bulk)
+    manager.service = SimpleNamespace(close=_noop)
+    manager.db_manager = SimpleNamespace(close=_noop)
+    return manager
+
+
+def _recorder(batches):
+    async def store_messages_bulk(batch):
+        batches.append([message for _, message, _, _, _ in batch])
+        return len(batch)
+    return store_messages_bulk
+
+
+def test_messages_are_written_in_order_in_capped_batches():
+    """Queued messages are stored in order, at most MESSAGE_BATCH_SIZE per batch"""
+    batches = []
+
+    async def run():
+        manager = _manager(_recorder(batches))
+        for i in range(150):
+            await manager.store_message("user", f"m{i}", "user", "conv")
+        await manager.close()
+
+    asyncio.run(run())
+    size = agent_manager.MESSAGE_BATCH_SIZE
+    assert [len(batch) for batch in batches] == [size, size, 150 - 2 * size]
+    assert [message for batch in batches for message in batch] == [f"m{i}" for i in range(150)]
+
+
+def test_messages_within_flush_interval_share_a_batch():
+    """A message queued while the flusher waits joins the pending batch"""
+    batches = []
+
+    async def run():
+        manager = _manager(_recorder(batches))
+        await manager.store_message("user", "question", "user", "conv")
+        await asyncio.sleep(0)
+        await manager.store_message("user", "answer", "agent", "conv")
+        await manager.close()
+
+    asyncio.run(run())
+    assert batches == [["question", "answer"]]
+
+
+def test_close_drains_the_queue_and_stops_the_flusher():
+    """close() returns only after every queued message has been written"""
+    batches = []
+
+    async def run():
+        manager = _manager(_recorder(batches))
+        for i in range(3):
+            await manager.store_message("user", f"m{i}", "user", "conv")
+        flusher = manager._flusher_task
+        await manager.close()
+        await asyncio.sleep(0)
+        return manager, flusher
+
+    manager, flusher = asyncio.run(run())
+    assert batches == [["m0", "m1", "m2"]]
+    assert manager._flusher_task is None and flusher.cancelled()
+
+
+def test_failed_batch_is_logged_and_dropped(caplog):
+    """Storage is at-most-once: a failed batch is not retried and later batches still land"""
+    batches = []
+    calls = 0
+
+    async def store_messages_bulk(batch):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database is locked")
+        return await _recorder(batches)(batch)
+
+    async def run():
+        manager = _manager(store_messages_bulk)
+        await manager.store_message("user", "lost", "user", "conv")
+        await asyncio.sleep(agent_manager.MESSAGE_FLUSH_INTERVAL * 2)
+        await manager.store_message("user", "kept", "user", "conv")
+        await manager.close()
+
+    with caplog.at_level(logging.ERROR, logger=agent_manager.__name__):
+        asyncio.run(run())
+    assert batches == [["kept"]]
+    assert "database is locked" in caplog.text
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from rebalancr.execution.providers.kuru import rpc_pool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeSession:
+    """Answers every request with block 0x1, taking latencies[endpoint] fake seconds"""
+
+    def __init__(self, clock, latencies, down=()):
+        self.clock = clock
+        self.latencies = latencies
+        self.down = set(down)
+        self.posted = []
+
+    def post(self, endpoint, json=None, data=None, headers=None, timeout=None):
+        self.posted.append(endpoint)
+        if endpoint in self.down:
+            raise requests.ConnectionError(f"{endpoint} is down")
+        self.clock.now += self.latencies.get(endpoint, 0.0)
+        return SimpleNamespace(
+            raise_for_status=lambda: None,
+            content=b'{"jsonrpc": "2.0", "id": 0, "result": "0x1"}'
+        )
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    clock = FakeClock()
+    session = FakeSession(clock, {"http://a": 0.3, "http://b": 0.1, "http://c": 0.2, "http://d": 0.4})
+    monkeypatch.setattr(rpc_pool, "time", clock)
+    monkeypatch.setattr(rpc_pool, "get_pooled_session", lambda: session)
+    return clock, session
+
+
+def _pool(endpoints=("http://a", "http://b", "http://c", "http://d")):
+    pool = rpc_pool.RpcEndpointPool(list(endpoints))
+    pool._probe_thread.join()
+    return pool
+
+
+def test_active_ranks_endpoints_by_probed_latency(fake_network):
+    """The fastest ACTIVE_POOL_SIZE endpoints are used, best first"""
+    assert _pool().active() == ["http://b", "http://c", "http://a"]
+
+
+def test_probe_runs_in_background(monkeypatch):
+    """Construction doesn't wait on probes; the primary leads until they land"""
+    import threading
+
+    release = threading.Event()
+
+    def post(endpoint, **kwargs):
+        release.wait(5)
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(rpc_pool, "get_pooled_session", lambda: SimpleNamespace(post=post))
+    pool = rpc_pool.RpcEndpointPool(["http://a", "http://b"], primary="http://b")
+    assert pool.active() == ["http://b", "http://a"]
+    release.set()
+    pool._probe_thread.join()
+
+
+def test_ejected_endpoint_returns_after_cooldown(fake_network):
+    """Ejected endpoints leave rotation for EJECT_COOLDOWN seconds"""
+    clock, _ = fake_network
+    pool = _pool()
+
+    pool.eject("http://b")
+    assert pool.active() == ["http://c", "http://a", "http://d"]
+    clock.now += rpc_pool.EJECT_COOLDOWN
+    assert pool.active()[0] == "http://b"
+
+
+def test_provider_fails_over_and_ejects(fake_network):
+    """A failed endpoint is ejected and the request retried on the next one"""
+    _, session = fake_network
+    pool = _pool()
+    provider = rpc_pool.PooledHTTPProvider(pool)
+    session.down.add("http://b")
+    session.posted.clear()
+
+    assert provider.make_request("eth_blockNumber", [])["result"] == "0x1"
+    assert session.posted == ["http://b", "http://c"]
+    assert "http://b" not in pool.active()
+
+
+def test_provider_raises_when_all_endpoints_fail(fake_network):
+    """Reads fail with ConnectionError once every endpoint is down"""
+    _, session = fake_network
+    provider = rpc_pool.PooledHTTPProvider(_pool())
+    session.down.update(["http://a", "http://b", "http://c", "http://d"])
+
+    with pytest.raises(ConnectionError, match="eth_blockNumber"):
+        provider.make_request("eth_blockNumber", [])
+
+
+def test_state_reads_follow_writes_to_primary(fake_network):
+    """Nonce/receipt reads stay on the primary for a window after a write"""
+    clock, session = fake_network
+    pool = _pool()
+    provider = rpc_pool.PooledHTTPProvider(pool)
+    assert pool.candidates("eth_getTransactionCount")[0] == "http://b"
+
+    session.posted.clear()
+    provider.make_request("eth_sendRawTransaction", ["0x00"])
+    assert session.posted == ["http://a"]
+
+    assert pool.candidates("eth_getTransactionCount") == ["http://a", "http://b", "http://c"]
+    assert pool.candidates("eth_getTransactionReceipt")[0] == "http://a"
+    assert pool.candidates("eth_blockNumber")[0] == "http://b"
+
+    clock.now += rpc_pool.READ_AFTER_WRITE_WINDOW
+    assert pool.candidates("eth_getTransactionCount")[0] == "http://b"
@@ -0,0 +1,198 @@
+from decimal import Decimal
+
+import pytest
+from rebalancr.execution.providers.kuru.utils import format_amount_with_decimals
+
+
+def _reference(amount, decimals):
+    """Original Decimal-based conversion, kept as the semantic reference"""
+    return int(Decimal(str(amount)) * Decimal(10) ** Decimal(decimals))
+
+
+@pytest.mark.parametrize("amount", ["1.5", "1000", "0.000001", "-1.55", "-0.5", "12.3456789"])
+@pytest.mark.parametrize("decimals", [0, 1, 6, 18])
+def test_string_fast_path_matches_decimal(amount, decimals):
+    """String amounts truncate toward zero exactly like the Decimal path"""
+    assert format_amount_with_decimals(amount, decimals) == _reference(amount, decimals)
+
+
+@pytest.mark.parametrize("amount", ["1e-3", "2.5E2", "1.5\n", " 2 ", Decimal("2.125"), 1.25, 7])
+def test_non_plain_inputs_fall_back(amount):
+    """Scientific notation, surrounding whitespace, Decimal, float and int inputs keep their semantics"""
+    assert format_amount_with_decimals(amount, 6) == _reference(amount, 6)
+
+
+def test_multicall_read_round_trip():
+    """Calls are encoded into one aggregate3 eth_call and results come back in order"""
+    from types import SimpleNamespace
+
+    from eth_abi import decode, encode
+    from rebalancr.execution.providers.kuru.constants import MULTICALL3_ADDRESS
+    from rebalancr.execution.providers.kuru.utils import multicall_read
+
+    sent = []
+
+    def call(tx):
+        sent.append(tx)
+        (calls,) = decode(["(address,bool,bytes)[]"], bytes.fromhex(tx["data"][10:]))
+        # Echo each call's calldata back; the second call reverts
+        results = [(i != 1, data) for i, (_, _, data) in enumerate(calls)]
+        return encode(["(bool,bytes)[]"], [results])
+
+    web3 = SimpleNamespace(eth=SimpleNamespace(call=call))
+    target = "0x" + "11" * 20
+
+    assert multicall_read(web3, [(target, "0x01"), (target, "0x02"), (target, "03")]) == [b"\x01", None, b"\x03"]
+    assert len(sent) == 1 and sent[0]["to"] == MULTICALL3_ADDRESS
+    assert multicall_read(web3, []) == []
+
+
+def test_send_approval_encodes_max_approve(monkeypatch):
+    """The approval transaction carries approve(spender, MAX_UINT256) calldata"""
+    from types import SimpleNamespace
+
+    from eth_abi import decode
+    from web3 import Web3
+    from rebalancr.execution.providers.kuru import utils
+
+    token = "0x" + "22" * 20
+    spender = "0x" + "33" * 20
+    web3 = Web3()
+    erc20 = web3.eth.contract(address=Web3.to_checksum_address(token), abi=utils.ERC20_ABI_MIN)
+    # Real ABI encoding, with the allowance read stubbed to force an approval
+    contract = SimpleNamespace(
+        encode_abi=erc20.encode_abi,
+        functions=SimpleNamespace(allowance=lambda owner, spender: SimpleNamespace(call=lambda: 0))
+    )
+    monkeypatch.setattr(utils, "_get_erc20_contract", lambda wallet_provider, token_address: contract)
+    monkeypatch.setattr(utils, "_prefetch_tx_params", lambda wallet_provider, tx_params: {**tx_params, "nonce": 7})
+    monkeypatch.setattr(utils, "_PENDING_APPROVALS", {})
+
+    sent = []
+    wallet_provider = SimpleNamespace(
+        _web3=web3,
+        get_address=lambda: "0x" + "44" * 20,
+        send_transaction=lambda tx_params: sent.append(tx_params) or "0xabc"
+    )
+
+    assert utils.send_approval(wallet_provider, token, spender, 10) == ("0xabc", 7)
+    data = sent[0]["data"]
+    data = data if isinstance(data, str) else data.hex()
+    assert data.removeprefix("0x")[:8] == "095ea7b3"
+    assert decode(["address", "uint256"], bytes.fromhex(data.removeprefix("0x")[8:])) == (spender, utils.MAX_UINT256)
+
+
+def test_wait_for_receipts_batch_returns_tx_receipts(monkeypatch):
+    """Receipts the batched poll finds mined are read back through web3's public API"""
+    from types import SimpleNamespace
+
+    from rebalancr.execution.providers.kuru import utils
+
+    mined, pending = "0x" + "ab" * 32, "0x" + "cd" * 32
+    polls = []
+
+    def rpc_batch(web3, calls):
+        polls.append([params[0] for _, params in calls])
+        return [{"status": "0x1"}, None] if len(polls) == 1 else [{"status": "0x1"}]
+
+    monkeypatch.setattr(utils, "_rpc_batch", rpc_batch)
+    class Eth:
+        blocks = iter([16, 17])
+
+        @property
+        def block_number(self):
+            return next(self.blocks)
+
+        def get_transaction_receipt(self, tx_hash):
+            return {"transactionHash": tx_hash, "status": 1}
+
+    web3 = SimpleNamespace(eth=Eth())
+
+    receipts = utils.wait_for_receipts_batch(web3, [mined, pending], poll_latency=0)
+    assert receipts == {
+        mined: {"transactionHash": mined, "status": 1},
+        pending: {"transactionHash": pending, "status": 1},
+    }
+    assert polls == [[mined, pending], [pending]]
+
+
+def test_wait_for_receipts_batch_falls_back_without_batch_support(monkeypatch):
+    """An endpoint answering a batch with one error object is polled per transaction"""
+    from types import SimpleNamespace
+
+    from rebalancr.execution.providers.kuru import utils
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+
+    monkeypatch.setattr(utils, "get_pooled_session", lambda: SimpleNamespace(post=lambda *args, **kwargs: Response()))
+    tx_hashes = ["0x" + "ab" * 32, "0x" + "cd" * 32]
+    web3 = SimpleNamespace(
+        provider=SimpleNamespace(endpoint_uri="http://node"),
+        eth=SimpleNamespace(
+            block_number=16,
+            wait_for_transaction_receipt=lambda tx_hash, timeout, poll_latency: {"transactionHash": tx_hash}
+        )
+    )
+
+    with pytest.raises(ValueError, match="batch not supported"):
+        utils._rpc_batch(web3, [("eth_blockNumber", [])])
+    assert utils.wait_for_receipts_batch(web3, tx_hashes) == {
+        tx_hash: {"transactionHash": tx_hash} for tx_hash in tx_hashes
+    }
+
+
+def test_approve_tokens_clears_pending_on_timeout(monkeypatch):
+    """Approvals whose receipts never arrive don't stay pending"""
+    from types import SimpleNamespace
+
+    from rebalancr.execution.providers.kuru import utils
+
+    def send_approval(wallet_provider, token_address, spender_address, amount, min_nonce=None):
+        utils._PENDING_APPROVALS["0xabc"] = ("owner", token_address, spender_address)
+        return "0xabc", 1
+
+    def wait_for_receipts_batch(web3, tx_hashes):
+        raise TimeoutError("not mined")
+
+    monkeypatch.setattr(utils, "_PENDING_APPROVALS", {})
+    monkeypatch.setattr(utils, "send_approval", send_approval)
+    monkeypatch.setattr(utils, "wait_for_receipts_batch", wait_for_receipts_batch)
+
+    with pytest.raises(Exception, match="not mined"):
+        utils.approve_tokens(SimpleNamespace(_web3=None), [("0x" + "22" * 20, "0x" + "33" * 20, 10)])
+    assert utils._PENDING_APPROVALS == {}
+
+
+def test_prefetch_tx_params_uses_wallet_fee_policy(monkeypatch):
+    """Batched nonce/gas/base fee are priced by the wallet provider's own helpers"""
+    from types import SimpleNamespace
+
+    from rebalancr.execution.providers.kuru import utils
+
+    monkeypatch.setattr(utils, "_rpc_batch", lambda web3, calls: ["0x7", "0x5208", {"baseFeePerGas": "0x64"}])
+    wallet_provider = SimpleNamespace(
+        _web3=None,
+        get_address=lambda: "0x" + "44" * 20,
+        gas_limit_for=lambda gas_estimate: gas_estimate * 2,
+        fees_for_base_fee=lambda base_fee_per_gas: (1, base_fee_per_gas + 1)
+    )
+
+    prepared = utils._prefetch_tx_params(wallet_provider, {"to": "0x" + "22" * 20, "data": "0x"})
+    assert prepared["nonce"] == 7 and prepared["gas"] == 42000
+    assert (prepared["maxPriorityFeePerGas"], prepared["maxFeePerGas"]) == (1, 101)
+
+
+def test_prefetch_tx_params_leaves_other_providers_alone(monkeypatch):
+    """Providers without a public fee policy fill the fields in send_transaction"""
+    from types import SimpleNamespace
+
+    from rebalancr.execution.providers.kuru import utils
+
+    monkeypatch.setattr(utils, "_rpc_batch", lambda web3, calls: pytest.fail("unexpected RPC batch"))
+    tx_params = {"to": "0x" + "22" * 20, "data": "0x"}
+    assert utils._prefetch_tx_params(SimpleNamespace(get_address=lambda: "0x" + "44" * 20), tx_params) == tx_params
@@ -0,0 +1,107 @@
+import asyncio
+
+import orjson
+import pytest
+
+from rebalancr.intelligence.reviewer import TradeReviewer
+
+
+def _trade(asset, **overrides):
+    """A trade the rule-based review approves, so it needs the external AI"""
+    trade = {
+        "asset": asset,
+        "current_price": 100.0,
+        "direction": "increase",
+        "market_condition": "normal",
+    }
+    trade.update(overrides)
+    return trade
+
+
+def _verdict(confidence, approval=True, risk_score=3):
+    return {"approval": approval, "confidence": confidence, "reasoning": "ok", "risk_score": risk_score}
+
+
+@pytest.fixture
+def reviewer():
+    return TradeReviewer({"USE_EXTERNAL_AI": True, "REVIEWER_API_KEY": "key", "REVIEWER_API_URL": "http://reviewer"})
+
+
+def _stub_post_review(monkeypatch, reviewer, batched_reply, single_confidence=50):
+    """Answer batched prompts with batched_reply and single-trade prompts with one verdict"""
+    calls = []
+
+    async def post_review(prompt, trades=1):
+        calls.append(trades)
+        if trades > 1:
+            return batched_reply
+        return orjson.dumps(_verdict(single_confidence)).decode()
+
+    monkeypatch.setattr(reviewer, "_post_review", post_review)
+    return calls
+
+
+def test_batched_reply_maps_to_trades_in_order(monkeypatch, reviewer):
+    """One call reviews every trade, verdicts matched to trades by position"""
+    reply = orjson.dumps({"reviews": [_verdict(70), _verdict(80, approval=False, risk_score=6), _verdict(90)]}).decode()
+    calls = _stub_post_review(monkeypatch, reviewer, reply)
+
+    results = asyncio.run(reviewer.bulk_review([_trade("ETH"), _trade("BTC"), _trade("SOL")]))
+
+    assert calls == [3]
+    assert [(r.asset, r.confidence, r.approval, r.risk_score) for r in results] == [
+        ("ETH", 70.0, True, 3),
+        ("BTC", 80.0, False, 6),
+        ("SOL", 90.0, True, 3),
+    ]
+
+
+def test_batched_reply_of_wrong_length_falls_back_per_trade(monkeypatch, reviewer):
+    """A reply that can't be matched up is discarded and each trade reviewed alone"""
+    reply = orjson.dumps({"reviews": [_verdict(70), _verdict(80)]}).decode()
+    calls = _stub_post_review(monkeypatch, reviewer, reply)
+
+    results = asyncio.run(reviewer.bulk_review([_trade("ETH"), _trade("BTC"), _trade("SOL")]))
+
+    assert calls == [3, 1, 1, 1]
+    assert [(r.asset, r.confidence) for r in results] == [("ETH", 50.0), ("BTC", 50.0), ("SOL", 50.0)]
+
+
+def test_malformed_batched_entry_falls_back_per_trade(monkeypatch, reviewer):
+    """One invalid verdict in the batch sends every trade to its own review"""
+    reply = orjson.dumps({"reviews": [_verdict(70), _verdict(80, risk_score=50)]}).decode()
+    calls = _stub_post_review(monkeypatch, reviewer, reply)
+
+    results = asyncio.run(reviewer.bulk_review([_trade("ETH"), _trade("BTC")]))
+
+    assert calls == [2, 1, 1]
+    assert [(r.asset, r.confidence) for r in results] == [("ETH", 50.0), ("BTC", 50.0)]
+
+
+def test_cached_and_prescreened_trades_merge_with_batched_verdicts(monkeypatch, reviewer):
+    """Only trades needing the external AI go in the batch; results keep input order"""
+    cached = reviewer._to_request(_trade("BTC"))
+    reviewer._review_cache_put(cached, reviewer._review_from_dict(_verdict(65), "BTC"))
+    reply = orjson.dumps({"reviews": [_verdict(70), _verdict(90)]}).decode()
+    calls = _stub_post_review(monkeypatch, reviewer, reply)
+
+    results = asyncio.run(reviewer.bulk_review([
+        _trade("ETH"),
+        _trade("BTC"),
+        _trade("DOGE", manipulation_risk=0.9),
+        _trade("USDC", direction="maintain"),
+        _trade("BAD", current_price="not a price"),
+        _trade("SOL"),
+    ]))
+
+    assert calls == [2]
+    assert [(r.asset, r.approval, r.confidence) for r in results] == [
+        ("ETH", True, 70.0),
+        ("BTC", True, 65.0),
+        ("DOGE", False, 90.0),
+        ("USDC", True, 60.0),
+        ("BAD", False, 0.0),
+        ("SOL", True, 90.0),
+    ]
+    # Fresh batched verdicts are cached for the next identical request
+    assert reviewer._review_cache_get(reviewer._to_request(_trade("SOL"))).confidence == 90.0